@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Benchmarks for AkronNova
+
+Measures startup of AkronNovaDesktopCharacter (offscreen Qt), per-module import time, STT/TTS model
+load time and end-to-end turn latency against a local stub LLM/TTS server. Results are written as
+JSON to benchmarks/results/, named by commit, and compared with the previous run.
+
+"Cold" runs compile every module from scratch into an empty bytecode cache; "warm" runs reuse it.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # everything
+    python benchmarks/run_benchmarks.py --only imports turn
+    python benchmarks/run_benchmarks.py --repeat 10 --no-save
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+CONFIG_PATH = os.path.join(ROOT_DIR, "config", "settings.json")
+RESULTS_DIR = os.path.join(BENCH_DIR, "results")
+
+IMPORT_MODULES = [
+    "PyQt6.QtWidgets",
+    "PyQt6.QtWebEngineWidgets",
+    "numpy",
+    "requests",
+    "aiohttp",
+    "config_loader",
+    "main",
+    "live2d_handler",
+    "api_handler",
+    "speech_pipeline",
+    "vector_memory",
+    "conversation_store",
+    "stt_module",
+    "tts_module",
+]
+
+
+def summarize(samples):
+    """Summary statistics in milliseconds for a list of durations in seconds"""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "runs": len(ms),
+        "min_ms": round(ms[0], 2),
+        "median_ms": round(statistics.median(ms), 2),
+        "max_ms": round(ms[-1], 2),
+    }
+
+
+def run_child(name, pycache_prefix, timeout=120, *args):
+    """Run this script in a fresh interpreter for one measurement; returns its JSON result"""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONPYCACHEPREFIX=pycache_prefix)
+    command = [sys.executable, os.path.abspath(__file__), "--child", name, *args]
+    try:
+        process = subprocess.run(command, cwd=SRC_DIR, env=env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    lines = [line for line in process.stdout.splitlines() if line.startswith("{")]
+    if process.returncode != 0 or not lines:
+        error = (process.stderr.strip().splitlines() or ["exit code %d" % process.returncode])[-1]
+        return {"error": error}
+    return json.loads(lines[-1])
+
+
+def cold_and_warm(name, repeat, *args, timeout=120):
+    """One run against an empty bytecode cache, then `repeat` runs reusing it"""
+    with tempfile.TemporaryDirectory(prefix="akronnova-pycache-") as pycache:
+        cold = run_child(name, pycache, timeout, *args)
+        warm = [run_child(name, pycache, timeout, *args) for _ in range(repeat)]
+    return cold, warm
+
+
+# Benchmarks run in the parent process
+
+def startup_ms(report):
+    """A startup report (times in seconds) in milliseconds, keyed like the other results"""
+    if "error" in report:
+        return report
+    return {
+        "milestones": {f"{name}_ms": round(at * 1000, 2) for name, at in report["milestones"].items()},
+        "phases": {f"{phase['name']}_ms": round(phase["seconds"] * 1000, 2) for phase in report["phases"]},
+    }
+
+
+def bench_startup(repeat):
+    cold, warm = cold_and_warm("startup", repeat)
+    result = {"cold": startup_ms(cold)}
+    ok = [w for w in warm if "error" not in w]
+    if ok:
+        result["warm"] = {
+            milestone: summarize([w["milestones"][milestone] for w in ok])
+            for milestone in ok[0]["milestones"]
+        }
+        result["warm_phases"] = {
+            phase["name"]: summarize([p["seconds"] for w in ok for p in w["phases"] if p["name"] == phase["name"]])
+            for phase in ok[0]["phases"]
+        }
+    if len(ok) < len(warm):
+        result["errors"] = sorted({w["error"] for w in warm if "error" in w})
+    return result
+
+
+def bench_imports(repeat):
+    results = {}
+    for module in IMPORT_MODULES:
+        cold, warm = cold_and_warm("import", repeat, module)
+        if "error" in cold:
+            results[module] = {"error": cold["error"]}
+            continue
+        ok = [w["seconds"] for w in warm if "error" not in w]
+        results[module] = {"cold_ms": round(cold["seconds"] * 1000, 2)}
+        if ok:
+            results[module]["warm"] = summarize(ok)
+    return results
+
+
+def bench_models(repeat):
+    # Model loads are dominated by reading weights, so a single warm run is enough
+    cold, warm = cold_and_warm("models", min(repeat, 1), timeout=600)
+    return {"cold": cold, "warm": warm[0] if warm else None}
+
+
+def bench_turn(repeat, first_token_ms=80, token_ms=15, tts_ms=40):
+    """End-to-end turn: streamed LLM reply -> first sentence -> first synthesized audio"""
+    sys.path.insert(0, SRC_DIR)
+    sys.path.insert(0, BENCH_DIR)
+    from stub_server import StubServer
+
+    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    with StubServer(first_token_ms=first_token_ms, token_ms=token_ms, tts_ms=tts_ms) as stub, \
+            tempfile.TemporaryDirectory(prefix="akronnova-bench-") as workdir:
+        config["api_endpoints"].update(llm_server=f"{stub.url}/chat", tts_server=f"{stub.url}/tts")
+        config["memory"]["enabled"] = False
+        config["vector_memory"]["enabled"] = False
+        config["cache"]["enabled"] = False
+        config["context"]["summarize"] = False
+        config_path = os.path.join(workdir, "settings.json")
+        with open(config_path, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+
+        from api_handler import APIHandler
+        from live2d_handler import EmotionTagParser
+        from speech_pipeline import SpeechRouter
+
+        handler = APIHandler(config_path)
+        samples = {"first_token": [], "first_sentence": [], "first_audio": [], "reply": []}
+        for _ in range(repeat):
+            segments = []
+            router = SpeechRouter(EmotionTagParser({"joy": 3}), lambda text, cues: segments.append(text))
+            start = time.perf_counter()
+            first_token = first_sentence = first_audio = None
+            for delta in handler.chat_stream("Hello, how are you?"):
+                if first_token is None:
+                    first_token = time.perf_counter() - start
+                router.feed(delta)
+                if segments and first_sentence is None:
+                    first_sentence = time.perf_counter() - start
+                    handler.call_tts_pcm(segments[0])
+                    first_audio = time.perf_counter() - start
+            router.finish()
+            samples["reply"].append(time.perf_counter() - start)
+            samples["first_token"].append(first_token)
+            samples["first_sentence"].append(first_sentence)
+            samples["first_audio"].append(first_audio)
+        handler.close()
+
+    result = {name: summarize(values) for name, values in samples.items() if None not in values}
+    result["stub"] = {"first_token_ms": first_token_ms, "token_ms": token_ms, "tts_ms": tts_ms}
+    return result
+
+
+BENCHMARKS = {
+    "imports": bench_imports,
+    "startup": bench_startup,
+    "models": bench_models,
+    "turn": bench_turn,
+}
+
+
+# Measurements run in a fresh child interpreter (cwd is src/)
+
+def child_import(module):
+    sys.path.insert(0, SRC_DIR)
+    start = time.perf_counter()
+    __import__(module)
+    return {"seconds": time.perf_counter() - start}
+
+
+def child_startup():
+    sys.path.insert(0, SRC_DIR)
+    from startup_timer import get_startup_timer
+    startup = get_startup_timer()
+
+    import main
+    from PyQt6.QtCore import QTimer
+    from PyQt6.QtWidgets import QApplication
+
+    main.prepare_qt()  # QtWebEngine import and URL scheme registration, as in main.main()
+    with startup.phase("qt_application"):
+        app = QApplication([])
+        bridge = main.install_bridge(main.EventLoopBridge.for_qt(app))
+    window = main.AkronNovaDesktopCharacter()
+    window.startup_finished.connect(app.quit)
+    QTimer.singleShot(60000, app.quit)
+    bridge.run(app)
+    window.close()
+    report = startup.report()
+    if "ready" not in report["milestones"]:
+        raise RuntimeError("startup did not finish")
+    return report
+
+
+def child_models():
+    sys.path.insert(0, SRC_DIR)
+    from config_loader import get_config
+    from model_loader import ModelLoader, READY
+
+    config = get_config(CONFIG_PATH)
+
+    def create_tts():
+        from tts_module import TTSModule
+        return TTSModule()
+
+    def create_stt():
+        from stt_module import STTModule
+        return STTModule(model_path=config.get("voice.model_path", "../voice/en-us-0.22-lgraph"))
+
+    loader = ModelLoader()
+    loader.register("tts", create_tts, warmup=lambda tts: tts.warm_up())
+    loader.register("stt", create_stt, warmup=lambda stt: stt.warm_up())
+    start = time.perf_counter()
+    loader.start()
+    result = {}
+    for name in ("tts", "stt"):
+        try:
+            loader.get(name, timeout=600)
+        except Exception as e:
+            result[name] = {"error": f"{type(e).__name__}: {e}"}
+    timings = loader.timings()
+    for name in ("tts", "stt"):
+        if loader.state(name) == READY:
+            result[name] = {f"{key}_ms": round(value * 1000, 2) for key, value in timings[name].items()}
+    result["parallel_total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+
+CHILDREN = {
+    "import": child_import,
+    "startup": child_startup,
+    "models": child_models,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def previous_results(exclude=None):
+    if not os.path.isdir(RESULTS_DIR):
+        return None
+    files = sorted(f for f in os.listdir(RESULTS_DIR) if f.endswith(".json") and f != exclude)
+    if not files:
+        return None
+    with open(os.path.join(RESULTS_DIR, files[-1]), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def flatten(value, prefix=""):
+    """
+    Flatten nested results into {"startup.warm.ready.median_ms": 123.4, ...}.
+    Only timings are compared, and every timing is recorded in milliseconds under a key ending in "_ms".
+    """
+    if isinstance(value, dict):
+        items = {}
+        for key, child in value.items():
+            items.update(flatten(child, f"{prefix}{key}."))
+        return items
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and prefix.endswith("_ms."):
+        return {prefix[:-1]: value}
+    return {}
+
+
+def print_comparison(current, previous, threshold=0.1):
+    before = flatten(previous["benchmarks"])
+    after = flatten(current["benchmarks"])
+    print(f"\nCompared with {previous['commit']} ({previous['timestamp']}):")
+    for key in sorted(after):
+        if key not in before or not before[key]:
+            continue
+        change = (after[key] - before[key]) / before[key]
+        flag = "  <-- slower" if change > threshold else ""
+        print(f"  {key:<60} {before[key]:10.1f} -> {after[key]:10.1f} ms ({change:+.0%}){flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="benchmarks to run")
+    parser.add_argument("--repeat", type=int, default=5, help="warm runs per measurement")
+    parser.add_argument("--no-save", action="store_true", help="print results without writing them")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("args", nargs="*", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        print(json.dumps(CHILDREN[options.child](*options.args)))
+        return
+
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": options.repeat,
+        "benchmarks": {},
+    }
+    for name in options.only or list(BENCHMARKS):
+        print(f"Running {name}...", flush=True)
+        try:
+            results["benchmarks"][name] = BENCHMARKS[name](options.repeat)
+        except Exception as e:
+            results["benchmarks"][name] = {"error": f"{type(e).__name__}: {e}"}
+
+    print(json.dumps(results["benchmarks"], indent=2))
+    if options.no_save:
+        return
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    filename = f"{results['timestamp'].replace(':', '')}-{results['commit']}.json"
+    previous = previous_results(exclude=filename)
+    with open(os.path.join(RESULTS_DIR, filename), "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nSaved {os.path.relpath(os.path.join(RESULTS_DIR, filename), ROOT_DIR)}")
+    if previous:
+        print_comparison(results, previous)
+
+
+if __name__ == "__main__":
+    main()
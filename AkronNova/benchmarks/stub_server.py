@@ -0,0 +1,134 @@
+"""
+Stub LLM and TTS server for AkronNova benchmarks
+Answers like an OpenAI-style chat endpoint (streaming or not) and a WAV TTS endpoint, with
+configurable latencies, so turn latency can be measured without real models
+"""
+import io
+import json
+import threading
+import time
+import wave
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "Hey there! [joy] It's good to see you again. I was just thinking about ice cream, "
+    "honestly. What would you like to talk about today?"
+)
+
+
+class StubServer:
+    """
+    POST /chat: chat completions; streams SSE deltas word by word when the payload asks for it.
+    POST /tts: 16-bit mono WAV of silence, 60 ms per word of input.
+    """
+
+    def __init__(self, reply: str = DEFAULT_REPLY, first_token_ms: float = 80, token_ms: float = 15,
+                 tts_ms: float = 40, sample_rate: int = 22050):
+        self.reply = reply
+        self.first_token_ms = first_token_ms
+        self.token_ms = token_ms
+        self.tts_ms = tts_ms
+        self.sample_rate = sample_rate
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _wav(self, text: str) -> bytes:
+        frames = int(self.sample_rate * 0.06 * max(1, len(text.split())))
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(self.sample_rate)
+            wav.writeframes(bytes(frames * 2))
+        return buffer.getvalue()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, content_type, body: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.startswith("/tts"):
+                    time.sleep(server.tts_ms / 1000)
+                    self._send(200, "audio/wav", server._wav(payload.get("text", "")))
+                elif self.path.startswith("/chat"):
+                    self._chat(payload)
+                else:
+                    self._send(404, "text/plain", b"not found")
+
+            def _chat(self, payload):
+                time.sleep(server.first_token_ms / 1000)
+                if payload.get("max_tokens") == 1:
+                    # Speculative prefill
+                    body = {"choices": [{"message": {"content": ""}}]}
+                    self._send(200, "application/json", json.dumps(body).encode("utf-8"))
+                    return
+                if not payload.get("stream"):
+                    time.sleep(server.token_ms * len(server.reply.split()) / 1000)
+                    body = {"choices": [{"message": {"content": server.reply}}]}
+                    self._send(200, "application/json", json.dumps(body).encode("utf-8"))
+                    return
+
+                # Chunked like real inference servers, so clients see each event as soon as it is sent
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                words = server.reply.split(" ")
+                for i, word in enumerate(words):
+                    if i:
+                        time.sleep(server.token_ms / 1000)
+                    delta = word if i == 0 else " " + word
+                    chunk = {"choices": [{"delta": {"content": delta}}]}
+                    self._write_chunk(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+
+if __name__ == "__main__":
+    with StubServer() as stub:
+        print(f"Stub server listening on {stub.url} (POST /chat, POST /tts)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,174 @@
+"""
+Animation Scheduler for AkronNova
+Drives idle motions, blinking and talking on the Live2D view from one timer that only wakes when
+something is due
+"""
+import logging
+import random
+import time
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+from lip_sync import MOUTH_PARAMETER
+
+logger = logging.getLogger(__name__)
+
+IDLE = "idle"
+TALKING = "talking"
+PAUSED = "paused"
+
+EYE_PARAMETERS = ("ParamEyeLOpen", "ParamEyeROpen")
+
+
+class AnimationScheduler(QObject):
+    """
+    Keeps a deadline per animation event and arms a single-shot timer for the earliest one, so the
+    process sleeps between events instead of polling. While talking, frames are scheduled at the
+    lip-sync rate and idle motions are held back; while the window is not visible nothing runs.
+    idle_group None means the model has no idle motions to play.
+    mouth_source returns the current mouth opening, or None once speech is over.
+    """
+
+    def __init__(self, view, idle_interval_ms: int = 5000, idle_group: Optional[str] = "Idle",
+                 blink_enabled: bool = True, talk_fps: int = 30,
+                 mouth_source: Optional[Callable[[], Optional[float]]] = None, parent=None):
+        super().__init__(parent)
+        self.view = view
+        self.idle_interval_ms = idle_interval_ms
+        self._idle_group = idle_group
+        self.blink_enabled = blink_enabled
+        self.talk_interval_ms = max(1, 1000 // talk_fps)
+        self.mouth_source = mouth_source
+
+        self._talking = False
+        self._visible = False
+        self._due: Dict[str, float] = {}  # event -> monotonic deadline in ms
+        self._armed_for = 0.0
+        self._handlers = {
+            "idle": self._idle_motion,
+            "blink": self._blink,
+            "blink_open": self._blink_open,
+            "talk": self._talk_frame,
+        }
+        self.wakeups = 0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_due)
+
+    @property
+    def idle_group(self) -> Optional[str]:
+        return self._idle_group
+
+    @idle_group.setter
+    def idle_group(self, group: Optional[str]):
+        self._idle_group = group
+        if group is None:
+            self.cancel("idle")
+        elif "idle" not in self._due and self._visible and not self._talking:
+            self._schedule_idle()
+            self._arm()
+
+    @property
+    def state(self) -> str:
+        if not self._visible:
+            return PAUSED
+        return TALKING if self._talking else IDLE
+
+    @staticmethod
+    def _now() -> float:
+        return time.monotonic() * 1000
+
+    def schedule(self, event: str, delay_ms: float):
+        self._due[event] = self._now() + delay_ms
+        self._arm()
+
+    def cancel(self, event: str):
+        if self._due.pop(event, None) is not None:
+            self._arm()
+
+    def _arm(self):
+        if not self._visible or not self._due:
+            self._timer.stop()
+            return
+        self._armed_for = min(self._due.values())
+        delay = max(0, int(self._armed_for - self._now()))
+        # Frame-accurate wakeups only matter while talking
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer if self._talking else Qt.TimerType.CoarseTimer)
+        self._timer.start(delay)
+
+    def _run_due(self):
+        self.wakeups += 1
+        # Coarse timers may fire a little early; whatever the timer was armed for is due
+        now = max(self._now(), self._armed_for)
+        for event in [e for e, due in self._due.items() if due <= now]:
+            del self._due[event]
+            self._handlers[event]()
+        self._arm()
+
+    def _schedule_idle(self):
+        if self._idle_group is None:
+            return
+        jitter = random.uniform(0.8, 1.2)
+        self._due["idle"] = self._now() + self.idle_interval_ms * jitter
+
+    def _schedule_blink(self):
+        if self.blink_enabled:
+            self._due["blink"] = self._now() + random.uniform(2500, 6000)
+
+    def set_visible(self, visible: bool):
+        """Pause everything while the window is hidden or minimized"""
+        if visible == self._visible:
+            return
+        self._visible = visible
+        if visible:
+            # Restart the clocks instead of replaying everything that came due while hidden
+            if not self._talking:
+                self._schedule_idle()
+            self._schedule_blink()
+            if self._talking:
+                self._due["talk"] = self._now()
+        logger.debug(f"Animation {self.state}")
+        self._arm()
+
+    def start_talking(self):
+        """Speech started: drive the mouth every frame and hold idle motions back"""
+        if self._talking:
+            return
+        self._talking = True
+        self._due.pop("idle", None)
+        self._due["talk"] = self._now()
+        self._arm()
+
+    def stop_talking(self):
+        if not self._talking:
+            return
+        self._talking = False
+        self._due.pop("talk", None)
+        self.view.set_parameter(MOUTH_PARAMETER, 0.0)
+        self._schedule_idle()
+        self._arm()
+
+    def _idle_motion(self):
+        if not self._talking and self._idle_group is not None:
+            self.view.start_motion(self._idle_group, 0)
+            self._schedule_idle()
+
+    def _blink(self):
+        for parameter in EYE_PARAMETERS:
+            self.view.set_parameter(parameter, 0.0)
+        self._due["blink_open"] = self._now() + 120
+        self._schedule_blink()
+
+    def _blink_open(self):
+        for parameter in EYE_PARAMETERS:
+            self.view.set_parameter(parameter, 1.0)
+
+    def _talk_frame(self):
+        value = self.mouth_source() if self.mouth_source else None
+        if value is None:
+            self.stop_talking()
+            return
+        self.view.set_parameter(MOUTH_PARAMETER, round(value, 3))
+        self._due["talk"] = self._now() + self.talk_interval_ms
@@ -2,23 +2,204 @@
 API Handler for AkronNova
 Manages communication with TTS, LLM, and voice input systems
 """
+import asyncio
 import queue
+import aiohttp
 import requests
 import json
 import threading
 import time
-from typing import Dict, Any, Optional
-from config_loader import ConfigLoader
+import numpy as np
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, AsyncIterator, Callable, Iterator, Optional, Tuple
+from async_bridge import get_bridge
+from audio_player import decode_wav
+from config_loader import ConfigLoader, get_config, register_schema
+from context_window import ConversationContext
+from conversation_store import ConversationStore
+from response_cache import DiskLRUCache, cache_key
+from vector_memory import VectorMemory, create_embedder
+
+register_schema({
+    "http.pool_connections": int,
+    "http.pool_maxsize": int,
+    "http.keep_alive": bool,
+    "http.max_retries": int,
+    "http.backoff_factor": (int, float),
+    "http.retry_statuses": list,
+    "llm.temperature": (int, float),
+    "llm.max_tokens": int,
+    "context.max_prompt_tokens": int,
+    "context.min_recent_messages": int,
+    "context.summarize": bool,
+    "context.summary_max_tokens": int,
+    "memory.enabled": bool,
+    "memory.db_path": str,
+    "memory.recall_limit": int,
+    "vector_memory.enabled": bool,
+    "vector_memory.path": str,
+    "vector_memory.embedding_model": (str, type(None)),
+    "vector_memory.dim": int,
+    "vector_memory.min_score": (int, float),
+    "vector_memory.save_every": int,
+    "vector_memory.save_interval": (int, float),
+    "cache.enabled": bool,
+    "cache.directory": str,
+    "cache.max_mb": (int, float),
+    "cache.llm_enabled": bool,
+})
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session(config: ConfigLoader) -> requests.Session:
+    """
+    Return the process-wide HTTP session shared by every endpoint.
+    Pooling, keep-alive and retry policy come from the "http" section of the config on first use.
+    """
+    global _session
+    with _session_lock:
+        if _session is not None:
+            return _session
+
+        max_retries = config.get("http.max_retries", 2)
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,  # Never replay a request the server may already be generating for
+            status=max_retries,
+            backoff_factor=config.get("http.backoff_factor", 0.5),
+            status_forcelist=config.get("http.retry_statuses", [502, 503, 504]),
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=config.get("http.pool_connections", 4),
+            pool_maxsize=config.get("http.pool_maxsize", 8),
+            max_retries=retry
+        )
+
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["User-Agent"] = "VoiceAssistant/1.0"
+        if not config.get("http.keep_alive", True):
+            session.headers["Connection"] = "close"
+
+        _session = session
+        return _session
+
+
+SSE_DONE = object()
+
+
+def parse_sse_line(line: str):
+    """
+    Parse one line of an OpenAI-style SSE stream.
+    Returns the content delta, SSE_DONE at the end of the stream, or None for lines without content.
+    """
+    if not line or line.startswith(":"):
+        return None  # Keep-alive blank lines and SSE comments
+    if not line.startswith("data:"):
+        return None
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return SSE_DONE
+    chunk = json.loads(data)
+    choices = chunk.get("choices") or []
+    if not choices:
+        return None
+    delta = choices[0].get("delta") or {}
+    return delta.get("content")
+
+
+def iter_sse_deltas(response) -> Iterator[str]:
+    """
+    Yield text deltas from an OpenAI-style server-sent events response.
+    Falls back to the full message when the server ignores "stream" and answers with plain JSON.
+    """
+    if response.headers.get("Content-Type", "").startswith("application/json"):
+        content = response.json()['choices'][0]['message']['content']
+        if content:
+            yield content
+        return
+
+    response.encoding = "utf-8"  # SSE streams are always UTF-8
+    for line in response.iter_lines(decode_unicode=True):
+        delta = parse_sse_line(line)
+        if delta is SSE_DONE:
+            return
+        if delta:
+            yield delta
 
 
 class APIHandler:
-    def __init__(self, config_path: str = "../config/settings.json"):
-        self.config = ConfigLoader(config_path)
-        self.conversation_history = []
+    def __init__(self, config_path: str = "../config/settings.json", load_memory: bool = True):
+        """
+        With load_memory=False the response cache and vector memory start out disabled; build them
+        with create_cache() / create_vector_memory() (e.g. on a background thread) and hand them to
+        attach_cache() / attach_vector_memory().
+        """
+        self.config = get_config(config_path)
+        self.context = ConversationContext(
+            max_prompt_tokens=self.config.get("context.max_prompt_tokens", 2048),
+            min_recent_messages=self.config.get("context.min_recent_messages", 2),
+            summarizer=self._summarize if self.config.get("context.summarize", True) else None
+        )
+        # The live window; turns evicted by the context are folded into its summary
+        self.conversation_history = self.context.turns
+        self.store = None
+        if self.config.get("memory.enabled", True):
+            self.store = ConversationStore(self.config.get("memory.db_path", "../data/conversations.db"))
+        self.cache = None
+        self._prefill_recall = None  # (query, recalled messages) of the last speculative prefill
+        self.vector_memory = None
+        if load_memory:
+            self.attach_cache(self.create_cache())
+            self.attach_vector_memory(self.create_vector_memory())
         self.stt_working = False
         self.tts_url = self.config.get("api_endpoints.tts_server")
         self.llm_url = self.config.get("api_endpoints.llm_server")
         self.voice_input_url = self.config.get("api_endpoints.voice_input")
+        self.session = get_session(self.config)
+
+    def create_cache(self) -> Optional[DiskLRUCache]:
+        """Open the response cache (scans its directory); None when disabled"""
+        if not self.config.get("cache.enabled", True):
+            return None
+        return DiskLRUCache(
+            self.config.get("cache.directory", "../data/cache"),
+            int(self.config.get("cache.max_mb", 256) * 1024 * 1024)
+        )
+
+    def create_vector_memory(self) -> Optional[VectorMemory]:
+        """Load the embedder and the saved vector memory; None when disabled"""
+        if not self.config.get("vector_memory.enabled", True):
+            return None
+        embedder = create_embedder(
+            self.config.get("vector_memory.embedding_model"),
+            self.config.get("vector_memory.dim", 128)
+        )
+        return VectorMemory(
+            embedder, self.config.get("vector_memory.path", "../data/vector_memory"),
+            save_every=self.config.get("vector_memory.save_every", 20),
+            save_interval=self.config.get("vector_memory.save_interval", 60.0)
+        )
+
+    def attach_cache(self, cache: Optional[DiskLRUCache]):
+        self.cache = cache
+
+    def attach_vector_memory(self, vector_memory: Optional[VectorMemory]):
+        """Start recalling from vector_memory; until then recall falls back to the store's full-text search"""
+        if vector_memory is None:
+            return
+        self.vector_memory = vector_memory
+        if self.store is not None:
+            # Embed on the store's writer thread instead of the caller's
+            self.store.add_listener(self._embed_turns)
         
     def call_tts(self, text: str) -> Optional[bytes]:
         """Call TTS system to generate audio from text"""
@@ -27,7 +208,7 @@ class APIHandler:
                 "text": text,
                 "voice": "default"  # Adjust based on your STTS system
             }
-            response = requests.post(self.tts_url, json=payload, timeout=30)
+            response = self.session.post(self.tts_url, json=payload, timeout=30)
             if response.status_code == 200:
                 return response.content
             else:
@@ -37,47 +218,225 @@ class APIHandler:
             print(f"Error calling TTS: {e}")
             return None
 
-    def _make_request(self, payload):
+    def call_tts_pcm(self, text: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Call TTS system and decode the returned WAV in memory to (samples, sample_rate)"""
+        audio = self.call_tts(text)
+        if audio is None:
+            return None
+        try:
+            return decode_wav(memoryview(audio))
+        except Exception as e:
+            print(f"Error decoding TTS audio: {e}")
+            return None
+
+    def _record(self, role: str, content: str):
+        """Add a turn to the context window and the persistent conversation log"""
+        self.context.append(role, content)
+        if self.store is not None:
+            self.store.append(role, content)
+        if self.vector_memory is not None and self.store is None:
+            self.vector_memory.add(content, {"role": role})
+
+    def _embed_turns(self, turns):
+        for role, content in turns:
+            self.vector_memory.add(content, {"role": role})
+
+    def _recall(self, query: str, limit: int):
+        """Past turns relevant to query: nearest neighbours in vector memory, or full-text search of the store"""
+        if self.vector_memory is not None:
+            window = {turn["content"] for turn in self.conversation_history}
+            hits = self.vector_memory.search(
+                query, k=limit + len(window), min_score=self.config.get("vector_memory.min_score", 0.3)
+            )
+            return [
+                {"role": meta.get("role", "user"), "content": text}
+                for score, text, meta in hits if text not in window
+            ][:limit]
+        if self.store is not None:
+            return self.store.search(query, limit=limit, exclude_session=self.store.session)
+        return []
+
+    def _recall_messages(self, query: Optional[str] = None):
+        """Recall past turns relevant to query (default: the latest user message) as a system message"""
+        limit = self.config.get("memory.recall_limit", 3)
+        if not limit:
+            return []
+        if query is None:
+            query = next((turn["content"] for turn in reversed(self.conversation_history) if turn["role"] == "user"), "")
+        prefilled = self._prefill_recall
+        if prefilled is not None and prefilled[0] == query:
+            # The prefill already recalled for this text; reuse it so both prompts match
+            return prefilled[1]
+        try:
+            recalled = self._recall(query, limit)
+        except Exception as e:
+            print(f"Error recalling past conversations: {e}")
+            return []
+        if not recalled:
+            return []
+        lines = "\n".join(f"- {turn['role']}: {turn['content']}" for turn in recalled)
+        return [{"role": "system", "content": f"Relevant moments from earlier conversations:\n{lines}"}]
+
+    def _build_payload(self, stream: bool = False, pending_user_message: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the chat completion payload from the conversation history
+        pending_user_message previews the payload for a user turn that has not been recorded yet,
+        leaving the conversation untouched.
+        """
+        if pending_user_message is None:
+            messages = self.context.build_messages(recalled=self._recall_messages())
+            self._prefill_recall = None
+        else:
+            recalled = self._recall_messages(pending_user_message)
+            self._prefill_recall = (pending_user_message, recalled)
+            messages = self.context.preview_messages(pending_user_message, recalled=recalled)
+        return {
+            "model": "local-model",  # This can be adjusted based on your model
+            "messages": messages,
+            "temperature": self.config.get("llm.temperature", 0.7),
+            "max_tokens": self.config.get("llm.max_tokens", 300),
+            "stream": stream
+        }
+
+    def _cached_reply(self, payload: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a deterministic (temperature 0) request in the response cache.
+        Returns (key, cached reply); key is None when the request must not be cached.
+        """
+        if self.cache is None or not self.config.get("cache.llm_enabled", True) or payload["temperature"] != 0:
+            return None, None
+        messages = [(m["role"], " ".join(m["content"].split())) for m in payload["messages"]]
+        key = cache_key("llm", self.llm_url, payload["model"], payload["max_tokens"], messages)
+        cached = self.cache.get(key)
+        return key, cached.decode("utf-8") if cached is not None else None
+
+    def _store_reply(self, key: Optional[str], reply: str):
+        if key is not None and reply:
+            self.cache.put(key, reply.encode("utf-8"))
+
+    def _summarize(self, previous_summary: str, turns):
+        """Fold turns evicted from the context window into the rolling summary using the LLM"""
+        transcript = "\n".join(f"{turn['role']}: {turn['content']}" for turn in turns)
+        prompt = (
+            "Update the summary of a conversation between a user and their desktop companion. "
+            "Keep names, facts, preferences and open topics; answer with the summary only.\n\n"
+            f"Current summary: {previous_summary or '(none)'}\n\n"
+            f"New turns:\n{transcript}"
+        )
+        payload = {
+            "model": "local-model",
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": 0.2,
+            "max_tokens": self.config.get("context.summary_max_tokens", 200),
+            "stream": False
+        }
+        response = self._make_request(payload)
+        if response.status_code != 200:
+            print(f"Summary request failed with status {response.status_code}")
+            return previous_summary
+        return response.json()['choices'][0]['message']['content']
+
+    def close(self):
+        """Flush the conversation log and persist the vector memory"""
+        if self.store is not None:
+            self.store.close()
+        if self.vector_memory is not None:
+            self.vector_memory.save()
+
+    def _make_request(self, payload, stream: bool = False):
         """Internal method to make the actual request"""
         try:
             start_time = time.time()
 
-            response = requests.post(
+            response = self.session.post(
                 self.llm_url,
-                headers={
-                    "Content-Type": "application/json",
-                    "Connection": "close",  # Close connection after request
-                    "User-Agent": "VoiceAssistant/1.0"
-                },
+                headers={"Content-Type": "application/json"},
                 json=payload,
                 timeout=120,
-                allow_redirects=False
+                allow_redirects=False,
+                stream=stream
             )
 
             self.last_response_time = time.time()
 
-            print(f"Task done for {time.time()-start_time} seconds")
+            if stream:
+                print(f"Stream opened after {time.time()-start_time} seconds")
+            else:
+                print(f"Task done for {time.time()-start_time} seconds")
             return response
         except Exception as e:
             raise e
-    def chat(self, user_message):
+
+    def chat_stream(self, user_message: str) -> Iterator[str]:
+        """
+        Stream the AI response as text deltas.
+        The full reply is added to the conversation history once the stream ends.
+        On failure a single error message is yielded instead, like chat() returns one.
+        """
+        self._record("user", user_message)
+        payload = self._build_payload(stream=True)
+        key, cached = self._cached_reply(payload)
+        if cached is not None:
+            self._record("assistant", cached)
+            yield cached
+            return
+
+        parts = []
+        try:
+            start_time = time.time()
+            response = self._make_request(payload, stream=True)
+            with response:
+                if response.status_code != 200:
+                    print(f"Error from local AI server: {response.status_code} - {response.text}")
+                    yield "Sorry, I couldn't get a response from the local AI server."
+                    return
+
+                for delta in iter_sse_deltas(response):
+                    if not parts:
+                        print(f"First token after {time.time()-start_time} seconds")
+                    parts.append(delta)
+                    yield delta
+            self._store_reply(key, "".join(parts))
+        except requests.exceptions.ConnectionError:
+            yield "Error: Cannot connect to local AI server. Please make sure it's running on your phone."
+            return
+        except requests.exceptions.Timeout:
+            yield "Error: Local AI server request timed out."
+            return
+        except requests.exceptions.RequestException as e:
+            print(f"Request error: {e}")
+            yield f"Error making request to local AI: {str(e)}"
+            return
+        except (KeyError, IndexError, json.JSONDecodeError) as e:
+            print(f"Error parsing AI stream: {e}")
+            if not parts:
+                yield "Sorry, I received an invalid response from the AI server."
+                return
+        finally:
+            if parts:
+                self._record("assistant", "".join(parts))
+
+    def chat(self, user_message, on_delta: Optional[Callable[[str], None]] = None):
         """
         Chat method with threading to prevent blocking
+        When on_delta is given the reply is streamed and each text delta is passed to it as it arrives.
         """
+        if on_delta is not None:
+            parts = []
+            for delta in self.chat_stream(user_message):
+                on_delta(delta)
+                parts.append(delta)
+            return "".join(parts)
+
         # Add user message to conversation history
-        self.conversation_history.append({
-            "role": "user",
-            "content": user_message
-        })
+        self._record("user", user_message)
 
         # Prepare the request payload
-        payload = {
-            "model": "local-model",  # This can be adjusted based on your model
-            "messages": self.conversation_history,
-            "temperature": 0.7,
-            "max_tokens": 300,
-            "stream": False
-        }
+        payload = self._build_payload(stream=False)
+        key, cached = self._cached_reply(payload)
+        if cached is not None:
+            self._record("assistant", cached)
+            return cached
 
         # Make the request in a separate thread to prevent blocking
         response_queue = queue.Queue()
@@ -93,10 +452,8 @@ class APIHandler:
                         ai_response = result['choices'][0]['message']['content']
 
                         # Add AI response to conversation history
-                        self.conversation_history.append({
-                            "role": "assistant",
-                            "content": ai_response
-                        })
+                        self._record("assistant", ai_response)
+                        self._store_reply(key, ai_response)
 
                         response_queue.put(('success', ai_response))
                     except (KeyError, IndexError, json.JSONDecodeError) as e:
@@ -136,33 +493,196 @@ class APIHandler:
             return "Request timed out waiting for AI response."
 
 
+class AsyncAPIClient:
+    """
+    asyncio client for the LLM and TTS endpoints.
+    Shares configuration, conversation history and payload building with the APIHandler it wraps.
+    """
+
+    def __init__(self, handler: APIHandler):
+        self.handler = handler
+        self.config = handler.config
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.config.get("http.pool_maxsize", 8),
+                force_close=not self.config.get("http.keep_alive", True)
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"User-Agent": "VoiceAssistant/1.0"}
+            )
+        return self._session
+
+    async def _post(self, url: str, payload: Dict[str, Any], timeout: aiohttp.ClientTimeout):
+        """POST with the same retry policy as the shared requests session"""
+        session = await self._get_session()
+        max_retries = self.config.get("http.max_retries", 2)
+        backoff_factor = self.config.get("http.backoff_factor", 0.5)
+        retry_statuses = self.config.get("http.retry_statuses", [502, 503, 504])
+
+        for attempt in range(max_retries + 1):
+            last_attempt = attempt == max_retries
+            try:
+                response = await session.post(url, json=payload, timeout=timeout, allow_redirects=False)
+            except aiohttp.ClientConnectorError:
+                if last_attempt:
+                    raise
+            else:
+                if response.status not in retry_statuses or last_attempt:
+                    return response
+                response.release()
+            await asyncio.sleep(backoff_factor * (2 ** attempt))
+
+    async def tts(self, text: str) -> Optional[bytes]:
+        """Call TTS system to generate audio from text"""
+        payload = {
+            "text": text,
+            "voice": "default"
+        }
+        try:
+            response = await self._post(self.handler.tts_url, payload, aiohttp.ClientTimeout(total=30))
+            async with response:
+                if response.status == 200:
+                    return await response.read()
+                print(f"TTS request failed with status {response.status}: {await response.text()}")
+                return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"Error calling TTS: {e}")
+            return None
+
+    async def tts_pcm(self, text: str) -> Optional[Tuple[np.ndarray, int]]:
+        """Call TTS system and decode the returned WAV in memory to (samples, sample_rate)"""
+        audio = await self.tts(text)
+        if audio is None:
+            return None
+        try:
+            return decode_wav(memoryview(audio))
+        except Exception as e:
+            print(f"Error decoding TTS audio: {e}")
+            return None
+
+    async def chat_stream(self, user_message: str) -> AsyncIterator[str]:
+        """
+        Stream the AI response as text deltas.
+        Cancelling the consuming task stops the request; whatever was received so far is kept in the history.
+        """
+        self.handler._record("user", user_message)
+        payload = self.handler._build_payload(stream=True)
+        key, cached = self.handler._cached_reply(payload)
+        if cached is not None:
+            self.handler._record("assistant", cached)
+            yield cached
+            return
+
+        parts = []
+        try:
+            response = await self._post(
+                self.handler.llm_url, payload, aiohttp.ClientTimeout(total=None, sock_read=120)
+            )
+            async with response:
+                if response.status != 200:
+                    print(f"Error from local AI server: {response.status} - {await response.text()}")
+                    yield "Sorry, I couldn't get a response from the local AI server."
+                    return
+
+                if response.content_type == "application/json":
+                    result = await response.json()
+                    parts.append(result['choices'][0]['message']['content'])
+                    self.handler._store_reply(key, parts[0])
+                    yield parts[0]
+                    return
+
+                async for raw_line in response.content:
+                    delta = parse_sse_line(raw_line.decode("utf-8").rstrip("\r\n"))
+                    if delta is SSE_DONE:
+                        break
+                    if delta:
+                        parts.append(delta)
+                        yield delta
+                self.handler._store_reply(key, "".join(parts))
+        except aiohttp.ClientConnectorError:
+            yield "Error: Cannot connect to local AI server. Please make sure it's running on your phone."
+        except asyncio.TimeoutError:
+            yield "Error: Local AI server request timed out."
+        except aiohttp.ClientError as e:
+            print(f"Request error: {e}")
+            yield f"Error making request to local AI: {str(e)}"
+        except (KeyError, IndexError, json.JSONDecodeError) as e:
+            print(f"Error parsing AI stream: {e}")
+            if not parts:
+                yield "Sorry, I received an invalid response from the AI server."
+        finally:
+            if parts:
+                self.handler._record("assistant", "".join(parts))
+
+    async def prefill(self, user_message: str):
+        """
+        Speculatively send the prompt the next turn would produce, asking for a single token.
+        Servers with prompt caching (e.g. llama.cpp) then already hold the processed prefix when
+        the real request arrives; nothing is recorded in the history.
+        """
+        payload = self.handler._build_payload(stream=False, pending_user_message=user_message)
+        payload["max_tokens"] = 1
+        payload["cache_prompt"] = True
+        try:
+            response = await self._post(self.handler.llm_url, payload, aiohttp.ClientTimeout(total=60))
+            response.release()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Prefill request failed: {e}")
+
+    async def chat(self, user_message: str, on_delta: Optional[Callable[[str], None]] = None) -> str:
+        """Get the complete AI response, optionally passing each text delta to on_delta"""
+        parts = []
+        async for delta in self.chat_stream(user_message):
+            if on_delta:
+                on_delta(delta)
+            parts.append(delta)
+        return "".join(parts)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
 class AsyncAPIHandler(APIHandler):
-    """API Handler with async capabilities"""
-    
-    def __init__(self, config_path: str = "../config/settings.json"):
-        super().__init__(config_path)
-        self.response_callbacks = {}
-        
+    """
+    API Handler with async capabilities.
+    Requests run as coroutines on the shared event loop bridge instead of one thread per call;
+    every call returns a future whose cancel() interrupts it.
+    """
+
+    def __init__(self, config_path: str = "../config/settings.json", load_memory: bool = True):
+        super().__init__(config_path, load_memory)
+        self.client = AsyncAPIClient(self)
+        self.bridge = get_bridge()
+        # close() runs on the UI thread while the loop may be the one it is running on, so the
+        # aiohttp session is closed on the loop once the application quits
+        self.bridge.add_shutdown_hook(self.client.close)
+
     def call_tts_async(self, text: str, callback=None):
         """Call TTS system asynchronously"""
-        def _tts_worker():
-            result = self.call_tts(text)
-            if callback:
-                callback(result)
-                
-        thread = threading.Thread(target=_tts_worker)
-        thread.daemon = True
-        thread.start()
-        return thread
-        
+        return self.bridge.submit(self.client.tts(text), callback)
+
     def call_llm_async(self, prompt: str, callback=None):
         """Call LLM system asynchronously"""
-        def _llm_worker():
-            result = self.chat(prompt)
-            if callback:
-                callback(result)
-                
-        thread = threading.Thread(target=_llm_worker)
-        thread.daemon = True
-        thread.start()
-        return thread
\ No newline at end of file
+        return self.bridge.submit(self.client.chat(prompt), callback)
+
+    def call_llm_stream_async(self, prompt: str, on_delta: Callable[[str], None], callback=None):
+        """Stream the LLM reply asynchronously, passing each text delta to on_delta"""
+        return self.bridge.submit(self.client.chat(prompt, on_delta=self.bridge.wrap(on_delta)), callback)
+
+    def prefill_async(self, prompt: str):
+        """
+        Warm the LLM with the prompt a user turn is about to produce. Not cancelled by cancel_all():
+        the interruption that answers the same turn would otherwise throw the prefill away.
+        """
+        return self.bridge.submit(self.client.prefill(prompt), cancellable=False)
+
+    def cancel_all(self):
+        """Interrupt every request still in flight"""
+        self.bridge.cancel_all()
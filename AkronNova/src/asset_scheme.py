@@ -0,0 +1,188 @@
+"""
+Asset Scheme for AkronNova
+Serves the web page and Live2D assets to the web view over a custom akronnova:// URL scheme,
+from a packed archive held in memory with the app directories as fallback
+"""
+import io
+import logging
+import mimetypes
+import os
+import posixpath
+import threading
+import zipfile
+from typing import Dict, Iterable, Optional
+
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QUrl
+from PyQt6.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+
+logger = logging.getLogger(__name__)
+
+SCHEME = b"akronnova"
+HOST = "app"
+
+_MIME_TYPES = {
+    ".html": "text/html",
+    ".js": "text/javascript",
+    ".mjs": "text/javascript",
+    ".json": "application/json",
+    ".css": "text/css",
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".wasm": "application/wasm",
+    ".moc3": "application/octet-stream",
+    ".wav": "audio/wav",
+}
+
+
+def register_scheme():
+    """Declare the scheme to Chromium; must run before the QApplication is created"""
+    scheme = QWebEngineUrlScheme(SCHEME)
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    scheme.setFlags(
+        QWebEngineUrlScheme.Flag.SecureScheme |
+        QWebEngineUrlScheme.Flag.LocalScheme |
+        QWebEngineUrlScheme.Flag.LocalAccessAllowed |
+        QWebEngineUrlScheme.Flag.CorsEnabled |
+        QWebEngineUrlScheme.Flag.FetchApiAllowed
+    )
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+def mime_type(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    return _MIME_TYPES.get(extension) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+class AssetArchive:
+    """
+    A zip of app files (paths relative to the app root, e.g. "web/index.html"), read into memory
+    once so members are served without touching the disk again.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._zip = zipfile.ZipFile(io.BytesIO(f.read()))
+        self._members: Dict[str, zipfile.ZipInfo] = {
+            info.filename: info for info in self._zip.infolist() if not info.is_dir()
+        }
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._members
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def read(self, name: str) -> Optional[bytes]:
+        info = self._members.get(name)
+        return self._zip.read(info) if info is not None else None
+
+    def close(self):
+        self._zip.close()
+
+
+class AssetSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Answers akronnova://app/<path> with the file at <path> relative to the app root: from the
+    archive when it has it, otherwise from disk. Only paths inside `directories` (relative to the
+    root) are served.
+    """
+
+    def __init__(self, root_dir: str, archive_path: Optional[str] = None,
+                 directories: Iterable[str] = ("web", "assets"), parent=None):
+        super().__init__(parent)
+        self.root_dir = os.path.abspath(root_dir)
+        self.directories = tuple(d.strip("/") for d in directories)
+        self._warm: Dict[str, bytes] = {}
+        self._warm_lock = threading.Lock()
+        self.archive = None
+        if archive_path:
+            try:
+                self.archive = AssetArchive(archive_path)
+                logger.info(f"Serving assets from {archive_path} ({len(self.archive)} files)")
+            except (OSError, ValueError, zipfile.BadZipFile) as e:
+                logger.warning(f"Asset archive {archive_path} is unusable ({e}); serving from directories")
+
+    def _resolve(self, url: QUrl) -> Optional[str]:
+        path = posixpath.normpath(url.path(QUrl.ComponentFormattingOption.FullyDecoded)).lstrip("/")
+        if any(path.startswith(directory + "/") for directory in self.directories):
+            return path
+        return None
+
+    def warm(self, paths: Iterable[str], expire_after: float = 30.0):
+        """
+        Read files (relative to the root) on a background thread ahead of the page asking for them,
+        so the UI thread does not block on disk while the page boots. Each is served once from memory;
+        entries the page has not asked for within expire_after seconds are dropped.
+        """
+        paths = list(paths)
+
+        def _worker():
+            warmed = {}
+            for path in paths:
+                data = self._read(path)
+                if data is not None:
+                    warmed[path] = data
+                    with self._warm_lock:
+                        self._warm[path] = data
+            if warmed:
+                timer = threading.Timer(expire_after, self._expire, args=(warmed,))
+                timer.daemon = True
+                timer.start()
+
+        threading.Thread(target=_worker, name="asset-warmup", daemon=True).start()
+
+    def _expire(self, warmed: Dict[str, bytes]):
+        with self._warm_lock:
+            unread = [path for path, entry in warmed.items() if self._warm.get(path) is entry]
+            for path in unread:
+                del self._warm[path]
+        if unread:
+            logger.debug(f"Dropped {len(unread)} warmed assets the page never requested")
+
+    def _read(self, path: str) -> Optional[bytes]:
+        with self._warm_lock:
+            warmed = self._warm.pop(path, None)
+        if warmed is not None:
+            return warmed
+        if self.archive is not None and path in self.archive:
+            return self.archive.read(path)
+        file_path = os.path.join(self.root_dir, *path.split("/"))
+        try:
+            with open(file_path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob):
+        if job.requestMethod() not in (b"GET", b"HEAD"):
+            job.fail(QWebEngineUrlRequestJob.Error.RequestDenied)
+            return
+        path = self._resolve(job.requestUrl())
+        if path is None:
+            job.fail(QWebEngineUrlRequestJob.Error.RequestDenied)
+            return
+        data = self._read(path)
+        if data is None:
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+
+        buffer = QBuffer(job)  # Owned by the job, freed when the request finishes
+        buffer.setData(QByteArray(data))
+        buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+        content_type = mime_type(path)
+        if content_type.startswith("text/") or content_type == "application/json":
+            content_type += "; charset=utf-8"
+        job.reply(content_type.encode("ascii"), buffer)
+
+
+def asset_url(root_dir: str, path: str) -> Optional[str]:
+    """akronnova:// URL for a file under the app root, or None if it lies outside"""
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath(root_dir))
+    if relative.startswith(".."):
+        return None
+    url = QUrl()
+    url.setScheme(SCHEME.decode("ascii"))
+    url.setHost(HOST)
+    url.setPath("/" + relative.replace(os.sep, "/"))
+    return url.toString(QUrl.ComponentFormattingOption.FullyEncoded)
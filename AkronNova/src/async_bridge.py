@@ -0,0 +1,180 @@
+"""
+Async Bridge for AkronNova
+Runs asyncio coroutines alongside the Qt event loop
+"""
+import asyncio
+import concurrent.futures
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+_bridge = None
+_bridge_lock = threading.Lock()
+
+
+class EventLoopBridge:
+    """
+    Owns the asyncio loop used for network I/O.
+    With qasync installed the loop is the Qt event loop itself, so coroutines and their callbacks
+    run on the UI thread. Without it a single background thread runs the loop, and callbacks are
+    handed to dispatch (for_qt() posts them to the Qt thread) or, without one, invoked there.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, qt_integrated: bool,
+                 dispatch: Optional[Callable[[Callable[[], None]], None]] = None):
+        self.loop = loop
+        self.qt_integrated = qt_integrated
+        self.dispatch = dispatch
+        self._tasks = set()
+        self._tasks_lock = threading.Lock()
+        self._shutdown_hooks = []
+
+    @classmethod
+    def for_qt(cls, app) -> "EventLoopBridge":
+        """Create a bridge on top of the Qt application's event loop, if qasync is available"""
+        if qasync is None:
+            logger.info("qasync not installed; running asyncio on a background thread")
+            return cls.in_background(dispatch=_QtDispatcher(app).post)
+        loop = qasync.QEventLoop(app)
+        asyncio.set_event_loop(loop)
+        return cls(loop, qt_integrated=True)
+
+    @classmethod
+    def in_background(cls, dispatch=None) -> "EventLoopBridge":
+        """Create a bridge whose loop runs on a dedicated daemon thread"""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, name="asyncio-loop", daemon=True)
+        thread.start()
+        return cls(loop, qt_integrated=False, dispatch=dispatch)
+
+    def wrap(self, callback: Optional[Callable]) -> Optional[Callable]:
+        """Return callback made safe to call from the loop: it runs where the bridge's callbacks run"""
+        if callback is None or self.dispatch is None:
+            return callback
+
+        def _dispatched(*args):
+            self.dispatch(lambda: callback(*args))
+        return _dispatched
+
+    def submit(self, coro: Awaitable, callback: Optional[Callable[[Any], None]] = None,
+               cancellable: bool = True):
+        """
+        Schedule a coroutine and return a handle whose cancel() interrupts it.
+        callback receives the result, or None if the coroutine failed or was cancelled.
+        Tasks submitted with cancellable=False are left running by cancel_all().
+        """
+        if self.qt_integrated:
+            future = asyncio.ensure_future(coro, loop=self.loop)
+        else:
+            future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        if cancellable:
+            with self._tasks_lock:
+                self._tasks.add(future)
+        callback = self.wrap(callback)
+
+        def _done(f):
+            with self._tasks_lock:
+                self._tasks.discard(f)
+            if f.cancelled():
+                result = None
+            elif f.exception() is not None:
+                logger.error(f"Async task failed: {f.exception()}")
+                result = None
+            else:
+                result = f.result()
+            if callback:
+                callback(result)
+
+        future.add_done_callback(_done)
+        return future
+
+    def cancel_all(self):
+        """Cancel every coroutine still in flight, e.g. when the user interrupts"""
+        with self._tasks_lock:
+            futures = list(self._tasks)
+        for future in futures:
+            future.cancel()
+
+    def add_shutdown_hook(self, hook: Callable[[], Awaitable]):
+        """Await hook() on the loop once the application quits, before the loop stops (e.g. to close sessions)"""
+        self._shutdown_hooks.append(hook)
+
+    async def _run_shutdown_hooks(self):
+        for hook in self._shutdown_hooks:
+            try:
+                await hook()
+            except Exception as e:
+                logger.error(f"Shutdown hook failed: {e}")
+
+    def shutdown(self, timeout: float = 5.0):
+        """Run the shutdown hooks, waiting at most timeout seconds for them"""
+        if not self._shutdown_hooks:
+            return
+        if self.qt_integrated:
+            try:
+                self.loop.run_until_complete(asyncio.wait_for(self._run_shutdown_hooks(), timeout))
+            except asyncio.TimeoutError:
+                logger.warning(f"Shutdown hooks did not finish within {timeout}s")
+            return
+        future = asyncio.run_coroutine_threadsafe(self._run_shutdown_hooks(), self.loop)
+        try:
+            future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            logger.warning(f"Shutdown hooks did not finish within {timeout}s")
+
+    def run(self, app) -> int:
+        """Run the application until it quits, then the shutdown hooks"""
+        if not self.qt_integrated:
+            code = app.exec()
+            self.shutdown()
+            return code
+
+        quit_event = asyncio.Event()
+        app.aboutToQuit.connect(quit_event.set)
+        with self.loop:
+            self.loop.run_until_complete(quit_event.wait())
+            self.shutdown()
+        return 0
+
+
+class _QtDispatcher:
+    """Runs callables on the thread of a Qt object (the application's), via a queued signal"""
+
+    def __init__(self, app):
+        from PyQt6.QtCore import QObject, pyqtSignal
+
+        class _Receiver(QObject):
+            invoke = pyqtSignal(object)
+
+        self._receiver = _Receiver()
+        self._receiver.moveToThread(app.thread())
+        # Emitted from the loop thread, so Qt queues each call onto the receiver's thread in order
+        self._receiver.invoke.connect(lambda fn: fn())
+
+    def post(self, fn: Callable[[], None]):
+        self._receiver.invoke.emit(fn)
+
+
+def install_bridge(bridge: EventLoopBridge) -> EventLoopBridge:
+    """Make bridge the process-wide default"""
+    global _bridge
+    with _bridge_lock:
+        _bridge = bridge
+    return bridge
+
+
+def get_bridge() -> EventLoopBridge:
+    """Return the process-wide bridge, starting a background loop if none was installed"""
+    global _bridge
+    with _bridge_lock:
+        if _bridge is None:
+            _bridge = EventLoopBridge.in_background()
+        return _bridge
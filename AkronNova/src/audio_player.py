@@ -0,0 +1,125 @@
+"""
+Audio Player for AkronNova
+Plays synthesized speech on the default output device
+"""
+import io
+import threading
+import wave
+from typing import Callable, Optional, Tuple, Union
+
+import numpy as np
+import sounddevice as sd
+
+
+def _read_wav(source) -> Tuple[np.ndarray, int]:
+    with wave.open(source, "rb") as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        frames = wav.readframes(wav.getnframes())
+
+    samples = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        samples = samples.reshape(-1, channels)
+    return samples, sample_rate
+
+
+def load_wav(path: str) -> Tuple[np.ndarray, int]:
+    """Read a 16-bit PCM WAV file into a float32 array in [-1, 1]"""
+    return _read_wav(path)
+
+
+def decode_wav(data: Union[bytes, memoryview]) -> Tuple[np.ndarray, int]:
+    """Decode 16-bit PCM WAV bytes held in memory into a float32 array in [-1, 1]"""
+    return _read_wav(io.BytesIO(data))
+
+
+class AudioPlayer:
+    def __init__(self, blocksize: int = 1024):
+        self.blocksize = blocksize
+        self.is_playing = False
+        self.position = 0  # Frames of the current buffer handed to the device so far
+        self.sample_rate = 0
+        self.latency = 0.0  # Seconds between handing a frame to the device and hearing it
+        self._stream = None
+        self._finished = threading.Event()
+        self._state_lock = threading.Lock()  # Orders starting a stream against stop()
+
+    def play(self, samples: np.ndarray, sample_rate: int, should_play: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Stream samples straight from memory to the output device.
+        Blocks until playback finishes or stop() is called. should_play is checked atomically with
+        starting the stream, so a stop() racing with this call either prevents or interrupts it;
+        returns False if playback did not start.
+        """
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        if samples.ndim == 1:
+            samples = samples.reshape(-1, 1)
+        total = len(samples)
+
+        def _callback(outdata, frames, time, status):
+            start = self.position
+            end = min(start + frames, total)
+            count = end - start
+            outdata[:count] = samples[start:end]
+            self.position = end
+            if count < frames:
+                outdata[count:] = 0
+                raise sd.CallbackStop()
+
+        with self._state_lock:
+            if should_play is not None and not should_play():
+                return False
+            self.position = 0
+            self.sample_rate = sample_rate
+            self._finished.clear()
+            stream = sd.OutputStream(
+                samplerate=sample_rate,
+                channels=samples.shape[1],
+                dtype="float32",
+                blocksize=self.blocksize,
+                callback=_callback,
+                finished_callback=self._finished.set
+            )
+            self._stream = stream
+            self.is_playing = True
+            try:
+                stream.start()
+            except BaseException:
+                self._stream = None
+                self.is_playing = False
+                stream.close()
+                raise
+        try:
+            self.latency = float(stream.latency)
+            self._finished.wait()
+        finally:
+            with self._state_lock:
+                self._stream = None
+                self.is_playing = False
+            stream.close()
+        return True
+
+    def stop(self):
+        """Interrupt the current playback"""
+        with self._state_lock:
+            stream = self._stream
+            if stream is not None:
+                stream.abort()
+            self._finished.set()
+            self.is_playing = False
+
+
+class AsyncAudioPlayer(AudioPlayer):
+    """Audio Player with async capabilities"""
+
+    def play_async(self, samples: np.ndarray, sample_rate: int, callback=None):
+        """Play samples in the background"""
+        def _play_worker():
+            self.play(samples, sample_rate)
+            if callback:
+                callback()
+
+        thread = threading.Thread(target=_play_worker)
+        thread.daemon = True
+        thread.start()
+        return thread
@@ -1,53 +1,269 @@
 import json
-from typing import Any, Union
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+_MISSING = object()
+_NUMBER = (int, float)
+
+# Expected types of known settings; values of the wrong type are reported and read as missing.
+# Only shared keys live here: each module adds the ones it reads with register_schema().
+SCHEMA: Dict[str, Union[type, Tuple[type, ...]]] = {
+    "app_name": str,
+    "version": str,
+    "api_endpoints.tts_server": str,
+    "api_endpoints.llm_server": str,
+    "api_endpoints.voice_input": str,
+}
+
+_configs: Dict[str, "ConfigLoader"] = {}
+_configs_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def compile_key(key_path: str) -> Tuple[str, ...]:
+    """Split a dotted key path once; later lookups reuse the tuple"""
+    return tuple(key_path.split('.'))
+
+
+def _matches(value: Any, expected) -> bool:
+    if isinstance(value, bool) and expected in (int, _NUMBER):
+        return False
+    return isinstance(value, expected)
+
+
+def validate(config: dict, schema: Optional[dict] = None) -> List[str]:
+    """Return a message for every setting whose value does not match the schema"""
+    errors = []
+    for key_path, expected in (schema or SCHEMA).items():
+        value = _resolve(config, compile_key(key_path))
+        if value is not _MISSING and not _matches(value, expected):
+            errors.append(f"{key_path} should be {_type_names(expected)}, got {value!r}")
+    return errors
+
+
+def register_schema(schema: Dict[str, Union[type, Tuple[type, ...]]]):
+    """
+    Add the expected types of a module's settings. Files already loaded are checked against them
+    and their cached lookups are dropped, so the new types apply from the next get().
+    """
+    SCHEMA.update(schema)
+    with _configs_lock:
+        loaders = list(_configs.values())
+    for loader in loaders:
+        for error in validate(loader.config, schema):
+            print(f"Invalid setting in {loader.config_path}: {error}")
+        loader._state = (loader.config, {})
+
+
+def _type_names(expected) -> str:
+    return expected.__name__ if isinstance(expected, type) else "/".join(t.__name__ for t in expected)
+
+
+def _resolve(config: dict, keys: Tuple[str, ...]) -> Any:
+    value = config
+    for key in keys:
+        if isinstance(value, dict) and key in value:
+            value = value[key]
+        else:
+            return _MISSING
+    return value
+
+
+def _flatten(value: Any, prefix: str = "") -> Dict[str, Any]:
+    if not isinstance(value, dict):
+        return {prefix[:-1]: value}
+    items = {}
+    for key, child in value.items():
+        items.update(_flatten(child, f"{prefix}{key}."))
+    return items
 
 
 class ConfigLoader:
+    """
+    Settings parsed once and served from memory. Resolved lookups are cached until the file
+    changes; watch() reloads it when it is edited and notifies subscribers of the keys that changed.
+    Use get_config() to share one instance per file across the process.
+    """
     def __init__(self, config_path: str):
         self.config_path = config_path
-        self.config = self.load_config()
-        
+        self._state = (self.load_config(), {})  # (config, resolved key cache), swapped as a whole
+        self._subscribers: List[Tuple[Optional[str], Callable[[set], None]]] = []
+        self._lock = threading.Lock()
+        self._file_lock = threading.Lock()  # Orders save() against the watcher's mtime check
+        self._watcher = None
+        self._mtime = self._stat_mtime()
+
+    @property
+    def config(self) -> dict:
+        return self._state[0]
+
+    def _stat_mtime(self) -> float:
+        try:
+            return os.stat(self.config_path).st_mtime
+        except OSError:
+            return 0.0
+
     def load_config(self) -> dict:
         """Load configuration from JSON file"""
         try:
             with open(self.config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+                config = json.load(f)
         except FileNotFoundError:
             print(f"Config file not found at {self.config_path}")
             return {}
         except json.JSONDecodeError:
             print(f"Invalid JSON in config file: {self.config_path}")
             return {}
-            
+        for error in validate(config):
+            print(f"Invalid setting in {self.config_path}: {error}")
+        return config
+
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         Get a configuration value using dot notation
         Example: get("api_endpoints.tts_server")
         """
-        keys = key_path.split('.')
-        value = self.config
-        
-        for key in keys:
-            if isinstance(value, dict) and key in value:
-                value = value[key]
-            else:
-                return default
-                
-        return value
-        
+        config, cache = self._state
+        value = cache.get(key_path, _MISSING)
+        if value is _MISSING and key_path not in cache:
+            value = _resolve(config, compile_key(key_path))
+            expected = SCHEMA.get(key_path)
+            if value is not _MISSING and expected is not None and not _matches(value, expected):
+                # Reported once per loaded file: the cached _MISSING answers later lookups
+                print(f"Ignoring {key_path} in {self.config_path}: should be {_type_names(expected)}, "
+                      f"got {value!r}; using {default!r}")
+                value = _MISSING
+            cache[key_path] = value
+        return default if value is _MISSING else value
+
     def set(self, key_path: str, value: Any):
         """Set a configuration value using dot notation"""
-        keys = key_path.split('.')
-        config_ref = self.config
-        
-        for key in keys[:-1]:
-            if key not in config_ref or not isinstance(config_ref[key], dict):
-                config_ref[key] = {}
-            config_ref = config_ref[key]
-            
-        config_ref[keys[-1]] = value
-        
+        keys = compile_key(key_path)
+        with self._lock:
+            config = json.loads(json.dumps(self.config))  # Readers keep the previous snapshot
+            config_ref = config
+            for key in keys[:-1]:
+                if key not in config_ref or not isinstance(config_ref[key], dict):
+                    config_ref[key] = {}
+                config_ref = config_ref[key]
+            config_ref[keys[-1]] = value
+            self._state = (config, {})
+        self._notify({key_path})
+
     def save(self):
-        """Save the current configuration to file"""
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(self.config, f, indent=2, ensure_ascii=False)
\ No newline at end of file
+        """Save the current configuration to file, atomically replacing the old one"""
+        directory = os.path.dirname(os.path.abspath(self.config_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".settings-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self.config, f, indent=2, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            with self._file_lock:
+                os.replace(tmp_path, self.config_path)
+                self._mtime = self._stat_mtime()
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def reload(self) -> set:
+        """Re-read the file; returns the dotted keys whose values changed"""
+        if not os.path.exists(self.config_path):
+            return set()
+        config = self.load_config()
+        if not config:
+            return set()  # Keep the last good configuration while the file is broken
+        with self._lock:
+            before = _flatten(self.config)
+            after = _flatten(config)
+            changed = {key for key in before.keys() | after.keys() if before.get(key, _MISSING) != after.get(key, _MISSING)}
+            self._state = (config, {})
+        if changed:
+            print(f"Reloaded {self.config_path}: {', '.join(sorted(changed))}")
+            self._notify(changed)
+        return changed
+
+    def subscribe(self, callback: Callable[[set], None], prefix: Optional[str] = None):
+        """
+        Call callback(changed_keys) when settings under prefix (all settings if None) change.
+        Callbacks run on the thread that noticed the change, usually the watcher thread.
+        """
+        self._subscribers.append((prefix, callback))
+
+    def _notify(self, changed: set):
+        for prefix, callback in list(self._subscribers):
+            keys = changed if prefix is None else {
+                key for key in changed if key == prefix or key.startswith(prefix + ".")
+            }
+            if keys:
+                try:
+                    callback(keys)
+                except Exception as e:
+                    print(f"Config subscriber failed: {e}")
+
+    def watch(self, poll_interval: float = 1.0):
+        """Reload automatically when the file changes (inotify on Linux, mtime polling elsewhere)"""
+        if self._watcher is not None:
+            return
+        target = self._inotify_loop if sys.platform.startswith("linux") else self._poll_loop
+        self._watcher = threading.Thread(target=target, args=(poll_interval,), name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def _check(self):
+        with self._file_lock:
+            mtime = self._stat_mtime()
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+        self.reload()
+
+    def _poll_loop(self, poll_interval: float):
+        while True:
+            time.sleep(poll_interval)
+            self._check()
+
+    def _inotify_loop(self, poll_interval: float):
+        import ctypes
+        import ctypes.util
+
+        IN_CLOSE_WRITE, IN_MOVED_TO, IN_CREATE = 0x8, 0x80, 0x100
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        fd = libc.inotify_init()
+        directory = os.path.dirname(os.path.abspath(self.config_path)).encode()
+        # Watch the directory: editors and save() replace the file instead of writing it in place
+        if fd < 0 or libc.inotify_add_watch(fd, directory, IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE) < 0:
+            print("inotify is unavailable; polling the config file for changes")
+            self._poll_loop(poll_interval)
+            return
+
+        name = os.path.basename(self.config_path).encode()
+        header = struct.Struct("iIII")  # wd, mask, cookie, len
+        while True:
+            data = os.read(fd, 4096)
+            offset = 0
+            touched = False
+            while offset < len(data):
+                _, _, _, length = header.unpack_from(data, offset)
+                offset += header.size
+                touched |= data[offset:offset + length].rstrip(b"\0") == name
+                offset += length
+            if touched:
+                self._check()
+
+
+def get_config(config_path: str = "../config/settings.json") -> ConfigLoader:
+    """Return the process-wide loader for a settings file"""
+    key = os.path.abspath(config_path)
+    with _configs_lock:
+        if key not in _configs:
+            _configs[key] = ConfigLoader(config_path)
+        return _configs[key]
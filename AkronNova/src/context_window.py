@@ -0,0 +1,147 @@
+"""
+Conversation Context for AkronNova
+Keeps the prompt sent to the LLM within a token budget
+"""
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MESSAGE_OVERHEAD_TOKENS = 4  # Role and separators added by chat templates
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)"""
+    return len(text) // 4 + 1
+
+
+def message_tokens(message: Dict[str, str]) -> int:
+    return estimate_tokens(message.get("content", "")) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ConversationContext:
+    """
+    Sliding window over the conversation that fits a prompt token budget.
+    Turns that fall out of the window are handed to an optional summarizer in the background,
+    and the rolling summary is sent ahead of the window as a system message.
+    """
+
+    def __init__(self, max_prompt_tokens: int = 2048, min_recent_messages: int = 2,
+                 summarizer: Optional[Callable[[str, List[Dict[str, str]]], str]] = None,
+                 metrics_size: int = 100):
+        self.max_prompt_tokens = max_prompt_tokens
+        self.min_recent_messages = min_recent_messages
+        self.summarizer = summarizer
+        self.turns: List[Dict[str, str]] = []
+        self.summary = ""
+        self.metrics = deque(maxlen=metrics_size)
+        self._pending_eviction: List[Dict[str, str]] = []
+        self._summary_lock = threading.Lock()
+        self._summarizing = False
+        self._turn_count = 0
+
+    @property
+    def last_metrics(self) -> Optional[dict]:
+        return self.metrics[-1] if self.metrics else None
+
+    def append(self, role: str, content: str):
+        self.turns.append({"role": role, "content": content})
+
+    def _fit(self, turns: List[Dict[str, str]], system_messages, recalled) -> tuple:
+        """Return (prefix, index of the first turn that fits, tokens of the turns that fit)"""
+        prefix = list(system_messages or [])
+        if self.summary:
+            prefix.append({
+                "role": "system",
+                "content": f"Summary of the earlier conversation: {self.summary}"
+            })
+
+        budget = self.max_prompt_tokens - sum(message_tokens(m) for m in prefix + list(recalled or []))
+        window_tokens = sum(message_tokens(m) for m in turns)
+        start = 0
+        while window_tokens > budget and len(turns) - start > self.min_recent_messages:
+            window_tokens -= message_tokens(turns[start])
+            start += 1
+        return prefix, start, window_tokens
+
+    @staticmethod
+    def _with_recalled(turns: List[Dict[str, str]], recalled) -> List[Dict[str, str]]:
+        # Recalled memories depend on the latest user message, so they go right before it: everything
+        # ahead of them stays identical between turns and servers can reuse its cached prompt
+        if not recalled:
+            return list(turns)
+        if turns and turns[-1]["role"] == "user":
+            return turns[:-1] + list(recalled) + turns[-1:]
+        return list(turns) + list(recalled)
+
+    def build_messages(self, system_messages: Optional[List[Dict[str, str]]] = None,
+                       recalled: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """
+        Return the messages for the next request, evicting the oldest turns that do not fit.
+        system_messages (persona...) always go first; recalled messages go just before the latest
+        user turn. Both count against the budget.
+        """
+        prefix, start, window_tokens = self._fit(self.turns, system_messages, recalled)
+        evicted = self.turns[:start]
+        del self.turns[:start]  # In place: callers hold on to this list
+        if evicted:
+            self._evict(evicted)
+
+        messages = prefix + self._with_recalled(self.turns, recalled)
+        self._turn_count += 1
+        self.metrics.append({
+            "turn": self._turn_count,
+            "time": time.time(),
+            "prompt_tokens": sum(message_tokens(m) for m in messages),
+            "messages": len(messages),
+            "window_messages": len(self.turns),
+            "evicted_messages": len(evicted),
+            "summary_tokens": estimate_tokens(self.summary) if self.summary else 0
+        })
+        logger.debug(f"Prompt: ~{self.metrics[-1]['prompt_tokens']} tokens in {len(messages)} messages")
+        return messages
+
+    def preview_messages(self, pending_user_message: str,
+                         system_messages: Optional[List[Dict[str, str]]] = None,
+                         recalled: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        """
+        The messages build_messages() would return once pending_user_message is appended, without
+        evicting, summarizing or recording anything.
+        """
+        turns = self.turns + [{"role": "user", "content": pending_user_message}]
+        prefix, start, _ = self._fit(turns, system_messages, recalled)
+        return prefix + self._with_recalled(turns[start:], recalled)
+
+    def _evict(self, evicted: List[Dict[str, str]]):
+        if self.summarizer is None:
+            return
+        with self._summary_lock:
+            self._pending_eviction.extend(evicted)
+            if self._summarizing:
+                return  # The running summarizer picks these up when it finishes
+            self._summarizing = True
+
+        thread = threading.Thread(target=self._summarize_worker, daemon=True)
+        thread.start()
+
+    def _summarize_worker(self):
+        while True:
+            with self._summary_lock:
+                batch = self._pending_eviction
+                self._pending_eviction = []
+                if not batch:
+                    self._summarizing = False
+                    return
+            try:
+                summary = self.summarizer(self.summary, batch)
+                if summary:
+                    self.summary = summary.strip()
+            except Exception as e:
+                logger.error(f"Conversation summarization failed: {e}")
+
+    def clear(self):
+        self.turns.clear()
+        self.summary = ""
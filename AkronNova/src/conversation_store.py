@@ -0,0 +1,179 @@
+"""
+Conversation Store for AkronNova
+Append-only SQLite log of every conversation turn with full-text recall
+"""
+import logging
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turns (
+    id INTEGER PRIMARY KEY,
+    session TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS turns_session ON turns(session);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS turns_fts USING fts5(content, content='turns', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS turns_ai AFTER INSERT ON turns BEGIN
+    INSERT INTO turns_fts(rowid, content) VALUES (new.id, new.content);
+END;
+"""
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class ConversationStore:
+    """
+    Writes go through a queue to a single writer thread that commits them in batches, so callers
+    (including the UI thread) never wait on the disk. Reads use their own connection; WAL mode lets
+    them run while the writer commits.
+    """
+
+    def __init__(self, db_path: str, batch_size: int = 64, flush_interval: float = 0.5):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.session = uuid.uuid4().hex
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._read_conn = self._connect()
+        self._read_lock = threading.Lock()
+        self._read_conn.executescript(_SCHEMA)
+        try:
+            self._read_conn.executescript(_FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            logger.warning("SQLite was built without FTS5; falling back to LIKE search")
+            self.has_fts = False
+        self._read_conn.commit()
+
+        self._listeners: List[Callable[[List[Tuple[str, str]]], None]] = []
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_worker, name="conversation-store", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def append(self, role: str, content: str):
+        """Queue a turn for writing; returns immediately"""
+        self._queue.put((self.session, role, content, time.time()))
+
+    def add_listener(self, callback: Callable[[List[Tuple[str, str]]], None]):
+        """
+        Call callback([(role, content), ...]) on the writer thread after each batch is written,
+        for follow-up work (e.g. embedding) that should not run on the caller's thread either
+        """
+        self._listeners.append(callback)
+
+    def flush(self):
+        """Block until every queued turn has been committed and passed to the listeners"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._writer.join()
+        with self._read_lock:
+            self._read_conn.close()
+
+    def _write_worker(self):
+        conn = self._connect()
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    self._queue.task_done()
+                    break
+                batch.append(item)
+
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT INTO turns(session, role, content, created) VALUES (?, ?, ?, ?)", batch
+                    )
+            except sqlite3.Error as e:
+                logger.error(f"Failed to write {len(batch)} conversation turns: {e}")
+            finally:
+                turns = [(role, content) for _, role, content, _ in batch]
+                for listener in self._listeners:
+                    try:
+                        listener(turns)
+                    except Exception as e:
+                        logger.error(f"Conversation store listener failed: {e}")
+                for _ in batch:
+                    self._queue.task_done()
+        conn.close()
+
+    def search(self, query: str, limit: int = 5, exclude_session: Optional[str] = None) -> List[Dict]:
+        """Return up to limit past turns most relevant to query, best match first"""
+        words = WORD_PATTERN.findall(query.lower())
+        if not words:
+            return []
+        exclude_session = exclude_session or ""
+
+        with self._read_lock:
+            if self.has_fts:
+                match = " OR ".join(f'"{word}"' for word in set(words))
+                rows = self._read_conn.execute(
+                    "SELECT turns.* FROM turns_fts JOIN turns ON turns.id = turns_fts.rowid "
+                    "WHERE turns_fts MATCH ? AND turns.session != ? "
+                    "ORDER BY bm25(turns_fts) LIMIT ?",
+                    (match, exclude_session, limit)
+                ).fetchall()
+            else:
+                clauses = " OR ".join("content LIKE ?" for _ in words)
+                rows = self._read_conn.execute(
+                    f"SELECT * FROM turns WHERE ({clauses}) AND session != ? ORDER BY id DESC LIMIT ?",
+                    [f"%{word}%" for word in words] + [exclude_session, limit]
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def recent(self, limit: int = 20, session: Optional[str] = None) -> List[Dict]:
+        """Return the latest turns in chronological order"""
+        with self._read_lock:
+            if session:
+                rows = self._read_conn.execute(
+                    "SELECT * FROM turns WHERE session = ? ORDER BY id DESC LIMIT ?", (session, limit)
+                ).fetchall()
+            else:
+                rows = self._read_conn.execute(
+                    "SELECT * FROM turns ORDER BY id DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [dict(row) for row in reversed(rows)]
+
+    def count(self) -> int:
+        with self._read_lock:
+            return self._read_conn.execute("SELECT COUNT(*) FROM turns").fetchone()[0]
@@ -0,0 +1,88 @@
+"""
+Lip Sync for AkronNova
+Turns synthesized speech into mouth-open values that follow the audio as it plays
+"""
+import logging
+import threading
+from typing import Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+MOUTH_PARAMETER = "ParamMouthOpenY"
+
+
+def compute_envelope(samples: np.ndarray, sample_rate: int, frame_rate: int = 30,
+                     floor_db: float = -45.0, gain: float = 1.0, smoothing: int = 2) -> np.ndarray:
+    """
+    Compute one mouth-open value in [0, 1] per animation frame of audio.
+    Block RMS is taken in dB and mapped linearly from floor_db (closed) to the chunk's peak (open),
+    then smoothed with a short moving average so the mouth does not flutter.
+    """
+    samples = np.asarray(samples, dtype=np.float32)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1)
+    if samples.size == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    hop = max(1, int(round(sample_rate / frame_rate)))
+    frames = -(-samples.size // hop)
+    padded = np.zeros(frames * hop, dtype=np.float32)
+    padded[:samples.size] = samples
+
+    blocks = padded.reshape(frames, hop)
+    rms = np.sqrt(np.mean(blocks * blocks, axis=1))
+    db = 20.0 * np.log10(rms + 1e-9)
+
+    peak = max(float(db.max()), floor_db + 1.0)
+    envelope = np.clip((db - floor_db) / (peak - floor_db) * gain, 0.0, 1.0)
+    if smoothing > 1 and envelope.size > 1:
+        kernel = np.full(smoothing, 1.0 / smoothing, dtype=np.float32)
+        envelope = np.convolve(envelope, kernel, mode="same")
+    return envelope.astype(np.float32)
+
+
+class LipSync:
+    """
+    Maps the audio player's playback clock onto the envelope of the chunk being played.
+    prepare() runs on the synthesis thread ahead of playback; value() is a cheap lookup for the UI
+    thread and does no audio analysis.
+    """
+
+    def __init__(self, player, frame_rate: int = 30, gain: float = 1.0):
+        self.player = player
+        self.frame_rate = frame_rate
+        self.gain = gain
+        self._envelope: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def prepare(self, samples: np.ndarray, sample_rate: int) -> np.ndarray:
+        return compute_envelope(samples, sample_rate, self.frame_rate, gain=self.gain)
+
+    def start(self, envelope: Optional[np.ndarray]):
+        """Follow envelope for the chunk that is about to play"""
+        with self._lock:
+            self._envelope = envelope
+
+    def stop(self):
+        with self._lock:
+            self._envelope = None
+
+    @property
+    def active(self) -> bool:
+        return self._envelope is not None
+
+    def value(self) -> float:
+        """Mouth opening for the audio currently coming out of the device"""
+        with self._lock:
+            envelope = self._envelope
+        player = self.player
+        if envelope is None or envelope.size == 0 or not player.is_playing or not player.sample_rate:
+            return 0.0
+
+        seconds = player.position / player.sample_rate - player.latency
+        index = int(seconds * self.frame_rate)
+        if index < 0 or index >= envelope.size:
+            return 0.0
+        return float(envelope[index])
@@ -3,16 +3,99 @@ Live2D Handler for AkronNova Desktop Character
 Integrates Live2D functionality with the PyQt desktop application
 """
 import json
-import chardet
+import re
+import time
 import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
 from loguru import logger
 from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QVBoxLayout, QWidget
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer
+from PyQt6.QtCore import Qt, QThread, QObject, pyqtSignal, pyqtSlot, QTimer
 from PyQt6.QtGui import QPainter, QPixmap, QPen, QColor
 from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtCore import QUrl
+from PyQt6.QtWebEngineCore import QWebEnginePage
+from PyQt6.QtCore import QUrl, QUrlQuery
 from PyQt6.QtWebChannel import QWebChannel
 
+from model_registry import decode_text, get_model_registry
+
+
+class EmotionTagParser:
+    """
+    Single-pass parser for emotion tags such as "[joy]", compiled once per emotion map.
+    Besides whole strings it accepts streamed chunks, holding back a trailing partial tag
+    until the chunk that completes it arrives.
+    """
+
+    def __init__(self, emo_map: dict):
+        self.emo_map = emo_map
+        keys = sorted(emo_map.keys(), key=len, reverse=True)
+        self.tags = [f"[{key}]" for key in keys]
+        self.pattern = re.compile(
+            r"\[(" + "|".join(re.escape(key) for key in keys) + r")\]", re.IGNORECASE
+        ) if keys else None
+        self.max_tag_len = max((len(tag) for tag in self.tags), default=0)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget any buffered partial tag and restart position counting"""
+        self._pending = ""
+        self._emitted = 0
+
+    def _scan(self, text: str, base: int) -> Tuple[List[Tuple[int, int]], str]:
+        if self.pattern is None:
+            return [], text
+        tags = []
+        pieces = []
+        last = 0
+        clean_len = base
+        for match in self.pattern.finditer(text):
+            piece = text[last:match.start()]
+            pieces.append(piece)
+            clean_len += len(piece)
+            tags.append((clean_len, self.emo_map[match.group(1).lower()]))
+            last = match.end()
+        pieces.append(text[last:])
+        return tags, "".join(pieces)
+
+    def parse(self, text: str) -> Tuple[List[Tuple[int, int]], str]:
+        """
+        Return ([(position, expression_index), ...], clean_text) for a complete string.
+        Each position is the offset in clean_text where the tag stood.
+        """
+        return self._scan(text, 0)
+
+    def _partial_tag_start(self, text: str) -> int:
+        """Index where a trailing, possibly incomplete tag begins, or -1"""
+        start = text.rfind("[", max(0, len(text) - self.max_tag_len))
+        if start == -1 or "]" in text[start:]:
+            return -1
+        candidate = text[start:].lower()
+        if any(tag.startswith(candidate) for tag in self.tags):
+            return start
+        return -1
+
+    def feed(self, chunk: str) -> Tuple[List[Tuple[int, int]], str]:
+        """
+        Parse the next streamed chunk. Positions count from the start of the stream's clean text.
+        """
+        text = self._pending + chunk
+        hold = self._partial_tag_start(text)
+        if hold == -1:
+            self._pending = ""
+        else:
+            text, self._pending = text[:hold], text[hold:]
+        tags, clean = self._scan(text, self._emitted)
+        self._emitted += len(clean)
+        return tags, clean
+
+    def flush(self) -> Tuple[List[Tuple[int, int]], str]:
+        """End of stream: release whatever was held back as plain text"""
+        clean = self._pending
+        self._emitted += len(clean)
+        self._pending = ""
+        return [], clean
+
 
 class Live2DModel:
     """
@@ -33,44 +116,23 @@ class Live2DModel:
             k.lower(): v for k, v in self.model_info["emotionMap"].items()
         }
         self.emo_str: str = " ".join([f"[{key}]," for key in self.emo_map.keys()])
+        self.emotion_parser = EmotionTagParser(self.emo_map)
         logger.info("Model Information Loaded.")
 
     def _load_file_content(self, file_path: str) -> str:
-        """Load the content of a file with robust encoding handling."""
-        encodings = ["utf-8", "utf-8-sig", "gbk", "gb2312", "ascii"]
-
-        for encoding in encodings:
-            try:
-                with open(file_path, "r", encoding=encoding) as file:
-                    return file.read()
-            except UnicodeDecodeError:
-                continue
-
-        try:
-            with open(file_path, "rb") as file:
-                raw_data = file.read()
-            detected = chardet.detect(raw_data)
-            detected_encoding = detected["encoding"]
-
-            if detected_encoding:
-                try:
-                    return raw_data.decode(detected_encoding)
-                except UnicodeDecodeError:
-                    pass
-        except Exception as e:
-            logger.error(f"Error detecting encoding for {file_path}: {e}")
-
-        raise UnicodeError(f"Failed to decode {file_path} with any encoding")
+        """Load the content of a file with robust encoding handling; the file is read once."""
+        with open(file_path, "rb") as file:
+            return decode_text(file.read(), file_path)
 
     def _lookup_model_info(self, model_name: str) -> dict:
         """
         Find the model information from the model dictionary and return the information about the matched model.
+        The dictionary is parsed once by the model registry and re-read only when it changes.
         """
         self.live2d_model_name = model_name
 
         try:
-            file_content = self._load_file_content(self.model_dict_path)
-            model_dict = json.loads(file_content)
+            return get_model_registry(self.model_dict_path).info(model_name)
         except FileNotFoundError as file_e:
             logger.critical(
                 f"Model dictionary file not found at {self.model_dict_path}."
@@ -86,76 +148,184 @@ class Live2DModel:
                 f"Error reading model dictionary file at {self.model_dict_path}."
             )
             raise uni_e
+        except KeyError as key_e:
+            logger.critical(f"Unable to find {model_name} in {self.model_dict_path}.")
+            raise key_e
         except Exception as e:
             logger.critical(
                 f"Error occurred while reading model dictionary file at {self.model_dict_path}."
             )
             raise e
 
-        matched_model = next(
-            (model for model in model_dict if model["name"] == model_name), None
-        )
-
-        if matched_model is None:
-            logger.critical(f"Unable to find {model_name} in {self.model_dict_path}.")
-            raise KeyError(
-                f"{model_name} not found in model dictionary {self.model_dict_path}."
-            )
-
-        return matched_model
+    def parse_emotions(self, text: str) -> Tuple[List[Tuple[int, int]], str]:
+        """
+        Find emotion tags and strip them in one pass.
+        Returns ([(position in clean text, expression index), ...], clean text).
+        """
+        return self.emotion_parser.parse(text)
 
     def extract_emotion(self, str_to_check: str) -> list:
         """
         Check the input string for any emotion keywords and return a list of values (the expression index) of the emotions found in the string.
         """
-        expression_list = []
-        str_to_check = str_to_check.lower()
-
-        i = 0
-        while i < len(str_to_check):
-            if str_to_check[i] != "[":
-                i += 1
-                continue
-            for key in self.emo_map.keys():
-                emo_tag = f"[{key}]"
-                if str_to_check[i : i + len(emo_tag)] == emo_tag:
-                    expression_list.append(self.emo_map[key])
-                    i += len(emo_tag) - 1
-                    break
-            i += 1
-        return expression_list
+        tags, _ = self.emotion_parser.parse(str_to_check)
+        return [expression for _, expression in tags]
 
     def remove_emotion_keywords(self, target_str: str) -> str:
         """
         Remove the emotion keywords from the input string and return the cleaned string.
         """
-        lower_str = target_str.lower()
+        _, clean = self.emotion_parser.parse(target_str)
+        return clean
+
+
+class Live2DBridge(QObject):
+    """
+    QWebChannel command bus between Python and the Live2D page.
+    Commands are coalesced per frame: a newer command with the same key (the emotion, a motion
+    group, one model parameter) replaces the queued one. At most one batch is in flight; the page
+    acknowledges each batch as it receives it, which releases the next one. Nothing is sent until
+    the page has connected. A batch that is not acknowledged is sent again with a doubling timeout,
+    at most MAX_RESENDS times; after that the page is treated as gone until it connects again.
+    While the page is suspended (hidden) sends are not retried at all.
+    """
+    commandsReady = pyqtSignal(str)  # Connected to from JavaScript
+    frameAcknowledged = pyqtSignal(int)
+    pageConnected = pyqtSignal()
+
+    FRAME_MS = 16
+    ACK_TIMEOUT_MS = 500
+    MAX_RESENDS = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._frame = 0
+        self._in_flight = None  # (frame, send time, commands by key) of the unacknowledged batch
+        self._connected = False
+        self._suspended = False
+        self._resends = 0
+        self.last_ack_latency = 0.0
+        self.superseded = 0
+        self.resent = 0
+
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.timeout.connect(self._flush)
+
+    def send(self, key: str, command: Dict[str, Any]):
+        """Queue a command; it replaces any queued command with the same key"""
+        if key in self._pending:
+            del self._pending[key]
+            self.superseded += 1
+        self._pending[key] = command
+        if self._connected and not self._flush_timer.isActive():
+            self._flush_timer.start(self.FRAME_MS)
+
+    def set_suspended(self, suspended: bool):
+        """While suspended, a batch the page has not acknowledged waits instead of being resent"""
+        self._suspended = suspended
+        if not suspended and self._connected and (self._pending or self._in_flight is not None):
+            self._flush_timer.start(0)
+
+    def disconnected(self):
+        """The page is being (re)loaded: hold commands until the new page connects"""
+        self._connected = False
+        self._flush_timer.stop()
+        self._requeue()
+
+    def _requeue(self):
+        """Put the unacknowledged batch back in front of the queue; newer commands win"""
+        if self._in_flight is None:
+            return
+        commands = self._in_flight[2]
+        self._in_flight = None
+        merged = OrderedDict((key, command) for key, command in commands.items() if key not in self._pending)
+        merged.update(self._pending)
+        self._pending = merged
 
-        for key in self.emo_map.keys():
-            lower_key = f"[{key}]".lower()
-            while lower_key in lower_str:
-                start_index = lower_str.find(lower_key)
-                end_index = start_index + len(lower_key)
-                target_str = target_str[:start_index] + target_str[end_index:]
-                lower_str = lower_str[:start_index] + lower_str[end_index:]
-        return target_str
+    def _flush(self):
+        if not self._connected:
+            return
+        if self._in_flight is not None:
+            frame, sent, _ = self._in_flight
+            timeout_ms = self.ACK_TIMEOUT_MS << self._resends
+            waited_ms = (time.monotonic() - sent) * 1000
+            if self._suspended:
+                return  # The ack, or set_suspended(False), wakes the bridge up again
+            if waited_ms < timeout_ms:
+                # The page has not answered yet: try again next frame, or just check for the
+                # timeout if nothing else is queued
+                self._flush_timer.start(self.FRAME_MS if self._pending else int(timeout_ms - waited_ms) + 1)
+                return
+            self._requeue()
+            if self._resends >= self.MAX_RESENDS:
+                logger.warning(f"Live2D page stopped acknowledging (frame {frame}); waiting for it to reconnect")
+                self._connected = False
+                return
+            self._resends += 1
+            self.resent += 1
+            logger.debug(f"Live2D page did not acknowledge frame {frame}; sending it again")
+        if not self._pending:
+            return
+
+        self._frame += 1
+        batch = {"frame": self._frame, "commands": list(self._pending.values())}
+        self._in_flight = (self._frame, time.monotonic(), self._pending)
+        self._pending = OrderedDict()
+        self.commandsReady.emit(json.dumps(batch, ensure_ascii=False))
+        if not self._suspended:
+            self._flush_timer.start(self.ACK_TIMEOUT_MS << self._resends)
+
+    @pyqtSlot()
+    def connected(self):
+        """Called from JavaScript when a (re)loaded page has subscribed to commandsReady"""
+        # A batch sent to the previous page will never be acknowledged; the new page gets it instead
+        self._requeue()
+        self._connected = True
+        self._resends = 0
+        self.pageConnected.emit()
+        if self._pending:
+            self._flush_timer.start(0)
+
+    @pyqtSlot(int)
+    def ack(self, frame: int):
+        """Called from JavaScript as soon as a batch has been received"""
+        if self._in_flight is not None and self._in_flight[0] == frame:
+            self.last_ack_latency = time.monotonic() - self._in_flight[1]
+            self._in_flight = None
+            self._resends = 0
+            if self._pending:
+                self._flush_timer.start(0)
+            else:
+                self._flush_timer.stop()
+        self.frameAcknowledged.emit(frame)
 
 
 class Live2DWebView(QWebEngineView):
     """
     A WebView widget to render Live2D models using HTML/JavaScript
     """
-    def __init__(self, parent=None):
+    ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    DEFAULT_MODEL = os.path.join(ROOT_DIR, "assets", "香風智乃", "香風智乃.model3.json")
+
+    def __init__(self, parent=None, profile=None):
         super().__init__(parent)
+        if profile is not None:
+            # A page of our own profile instead of the default one, so its storage persists
+            self.setPage(QWebEnginePage(profile, self))
+        self.model_path = None
+        self.texture_cache = None
+        self.oversample = 2.0
+        self.asset_handler = None
+        self.render_fps = {"idle": 15, "active": 60, "suspended": 0}
+        self.render_mode = "idle"
+        self._render_visible = True
+        self._render_reasons = set()
         self.setup_web_view()
         
     def setup_web_view(self):
-        """Setup the web view to display Live2D content"""
-        # Load the Live2D HTML page
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        html_path = os.path.join(current_dir, "..", "web", "index.html")
-        self.load(QUrl.fromLocalFile(html_path))
-        
+        """Setup the web view to display Live2D content; the page itself is loaded by load_model()"""
         # Set transparent background
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         # self.setStyleSheet("background:transparent;")
@@ -167,19 +337,118 @@ class Live2DWebView(QWebEngineView):
         settings.setAttribute(settings.WebAttribute.WebGLEnabled, True)
         settings.setAttribute(settings.WebAttribute.JavascriptEnabled, True)
         settings.setAttribute(settings.WebAttribute.PluginsEnabled, False)
-        
+
+        # Command bus to the page's JavaScript
+        self.bridge = Live2DBridge(self)
+        self.channel = QWebChannel(self.page())
+        self.channel.registerObject("live2dBridge", self.bridge)
+        self.page().setWebChannel(self.channel)
+        # Commands wait for the page to connect; a reload holds them until the new page does
+        self.page().loadStarted.connect(self.bridge.disconnected)
+        self.bridge.pageConnected.connect(lambda: self._update_render_mode(force=True))
+
+    def serve_assets(self, handler):
+        """
+        Load the page and models through an AssetSchemeHandler (akronnova://) instead of file://
+        URLs; files outside the app root keep using file:// URLs.
+        """
+        from asset_scheme import SCHEME
+        profile = self.page().profile()
+        if profile.urlSchemeHandler(SCHEME) is None:
+            profile.installUrlSchemeHandler(SCHEME, handler)
+        self.asset_handler = handler
+
+    def load_model(self, model_path: str = None, texture_cache=None, oversample: float = 2.0):
+        """
+        Load the Live2D page showing model_path (a model3.json).
+        With a texture cache, the smallest texture variant that stays sharp at the view's current
+        size and device pixel ratio is loaded instead of the full-resolution textures; the cache is
+        kept for models preloaded or switched to later.
+        """
+        self.texture_cache = texture_cache
+        self.oversample = oversample
+        self.model_path = self._select_variant(model_path or self.DEFAULT_MODEL)
+
+        url = QUrl(self._file_url(os.path.join(self.ROOT_DIR, "web", "index.html")))
+        query = QUrlQuery()
+        query.addQueryItem("model", self._file_url(self.model_path))
+        url.setQuery(query)
+        self.load(url)
+
+    def _select_variant(self, model_path: str) -> str:
+        if self.texture_cache is None:
+            return model_path
+        from texture_variants import required_texture_size
+        required = required_texture_size(self.width(), self.height(), self.devicePixelRatioF(), self.oversample)
+        return self.texture_cache.select(model_path, required)
+
+    def _file_url(self, path: str) -> str:
+        if self.asset_handler is not None:
+            from asset_scheme import asset_url
+            url = asset_url(self.ROOT_DIR, path)
+            if url is not None:
+                return url
+        return QUrl.fromLocalFile(os.path.abspath(path)).toString(QUrl.ComponentFormattingOption.FullyEncoded)
+
+    def preload_model(self, model_path: str):
+        """Load another model in the page without showing it, so switch_model() to it is instant"""
+        url = self._file_url(self._select_variant(model_path))
+        self.bridge.send(f"preload:{url}", {"type": "preload", "url": url})
+
+    def switch_model(self, model_path: str):
+        """Show another model in place of the current one, without reloading the page"""
+        self.model_path = self._select_variant(model_path)
+        self.bridge.send("model", {"type": "switch", "url": self._file_url(self.model_path)})
+
+    def configure_rendering(self, idle_fps: int = 15, active_fps: int = 60):
+        """Frame rates the page renders at when idle and while something is animating"""
+        self.render_fps.update(idle=idle_fps, active=active_fps)
+        self._update_render_mode(force=True)
+
+    def set_render_active(self, reason: str, active: bool):
+        """Render at the active frame rate while any reason (e.g. "speech", "drag") holds"""
+        if active:
+            self._render_reasons.add(reason)
+        else:
+            self._render_reasons.discard(reason)
+        self._update_render_mode()
+
+    def set_render_visible(self, visible: bool):
+        """Stop rendering entirely while the window cannot be seen"""
+        self._render_visible = visible
+        self._update_render_mode()
+
+    def _update_render_mode(self, force: bool = False):
+        if not self._render_visible:
+            mode = "suspended"
+        else:
+            mode = "active" if self._render_reasons else "idle"
+        if mode != self.render_mode or force:
+            self.render_mode = mode
+            self.bridge.send("render", {"type": "render", "mode": mode, "fps": self.render_fps[mode]})
+            self.bridge.set_suspended(mode == "suspended")
+
     def set_emotion(self, emotion_index: int):
-        """Set the emotion for the Live2D model via JavaScript"""
-        script = f"window.setLive2DEmotion({emotion_index});"
-        self.page().runJavaScript(script)
+        """Set the emotion for the Live2D model"""
+        self.bridge.send("emotion", {"type": "emotion", "index": emotion_index})
+
+    def start_motion(self, group: str, index: int = 0):
+        """Play a motion from the model's motion group; skipped while the page is suspended"""
+        if self.render_mode == "suspended":
+            return
+        self.bridge.send(f"motion:{group}", {"type": "motion", "group": group, "index": index})
+
+    def set_parameter(self, parameter_id: str, value: float):
+        """Set a model parameter such as ParamMouthOpenY; only the latest value per frame is sent"""
+        self.bridge.send(f"param:{parameter_id}", {"type": "param", "id": parameter_id, "value": value})
 
 
 class Live2DIntegration:
     """
     Integration class that connects Live2D functionality with the AkronNova application
     """
-    def __init__(self):
-        self.live2d_model = Live2DModel("香風智乃")
+    def __init__(self, model_name: str = "香風智乃"):
+        self.live2d_model = Live2DModel(model_name)
         self.current_emotion = 0  # Default neutral emotion
         self.is_loaded = False
         
@@ -188,9 +457,8 @@ class Live2DIntegration:
         Process text to extract emotions and return clean text
         Returns: (emotion_list, clean_text)
         """
-        emotions = self.live2d_model.extract_emotion(text)
-        clean_text = self.live2d_model.remove_emotion_keywords(text)
-        return emotions, clean_text
+        tags, clean_text = self.live2d_model.parse_emotions(text)
+        return [expression for _, expression in tags], clean_text
     
     def set_emotion(self, emotion_index: int):
         """
@@ -199,8 +467,40 @@ class Live2DIntegration:
         self.current_emotion = emotion_index
         logger.info(f"Set Live2D emotion to index: {emotion_index}")
         
+    def create_emotion_parser(self) -> EmotionTagParser:
+        """
+        Create a parser for streamed text; each reply needs its own because feed() keeps state
+        """
+        return EmotionTagParser(self.live2d_model.emo_map)
+
     def get_available_emotions(self):
         """
         Get available emotions for the current model
         """
-        return self.live2d_model.emo_map
\ No newline at end of file
+        return self.live2d_model.emo_map
+
+    def get_available_models(self) -> List[str]:
+        """
+        Names of the models in the model dictionary
+        """
+        return get_model_registry(self.live2d_model.model_dict_path).names()
+
+    def model_entry(self):
+        """
+        Registry entry of the current model
+        """
+        return get_model_registry(self.live2d_model.model_dict_path).get(self.live2d_model.live2d_model_name)
+
+    def preload_model(self, model_name: str):
+        """
+        Parse a model's files ahead of time; returns its registry entry
+        """
+        return get_model_registry(self.live2d_model.model_dict_path).preload(model_name)
+
+    def switch_model(self, model_name: str):
+        """
+        Make model_name the current model; returns its registry entry
+        """
+        self.live2d_model.set_model(model_name)
+        self.current_emotion = 0
+        return self.preload_model(model_name)
\ No newline at end of file
@@ -5,31 +5,71 @@ Main application file
 
 import sys
 import os
+import json
 import logging
 # Add the current directory to the path to allow imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from startup_timer import get_startup_timer
+from config_loader import get_config, register_schema
 
-# Set environment variables to address DirectComposition issues and GLES3 context errors
-os.environ['QTWEBENGINE_DISABLE_DIRECT_COMPOSITION'] = '1'
-os.environ['QT_ENABLE_HIGHDPI_SCALING'] = '1'
-os.environ['QT_QUICK_BACKEND'] = 'software'
-os.environ['QT_OPENGL'] = 'software'
-os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = '--disable-gpu --disable-software-rasterizer --disable-gpu-sandbox --disable-extensions --disable-plugins --disable-images --disable-web-security'
-os.environ['QTWEBENGINE_DISABLE_GPU'] = '1'
-os.environ['DISABLE_GPU'] = '1'
+register_schema({
+    "voice.enabled": bool,
+    "voice.model_path": str,
+    "voice.vad": str,
+    "voice.vad_aggressiveness": int,
+    "voice.endpoint_ms": int,
+    "voice.silence_ms": int,
+    "voice.speculative_prefill": bool,
+    "ui_settings.window_transparency": (int, float),
+    "ui_settings.always_on_top": bool,
+    "ui_settings.click_through": bool,
+    "live2d.model_name": str,
+    "live2d.preload_models": list,
+    "assets.use_scheme": bool,
+    "assets.archive": str,
+    "webengine.persistent_profile": bool,
+    "webengine.storage_path": str,
+    "webengine.http_cache_mb": (int, float),
+    "webengine.warmup": bool,
+    "textures.enabled": bool,
+    "textures.cache_dir": str,
+    "textures.sizes": list,
+    "textures.oversample": (int, float),
+    "rendering.force_software_rendering": bool,
+    "rendering.idle_fps": int,
+    "rendering.active_fps": int,
+    "animation.idle_animation_interval": int,
+    "animation.talk_animation_enabled": bool,
+    "animation.lip_sync_fps": int,
+    "animation.lip_sync_gain": (int, float),
+    "animation.movement_enabled": bool,
+})
+
+
+def configure_rendering(config):
+    """Qt/Chromium rendering environment; has to be set before QtWebEngine is loaded"""
+    os.environ['QTWEBENGINE_DISABLE_DIRECT_COMPOSITION'] = '1'
+    os.environ['QT_ENABLE_HIGHDPI_SCALING'] = '1'
+    flags = '--disable-extensions --disable-plugins --disable-images --disable-web-security'
+    if config.get("rendering.force_software_rendering", True):
+        # Set environment variables to address DirectComposition issues and GLES3 context errors
+        os.environ['QT_QUICK_BACKEND'] = 'software'
+        os.environ['QT_OPENGL'] = 'software'
+        os.environ['QTWEBENGINE_DISABLE_GPU'] = '1'
+        os.environ['DISABLE_GPU'] = '1'
+        flags = '--disable-gpu --disable-software-rasterizer --disable-gpu-sandbox ' + flags
+    os.environ['QTWEBENGINE_CHROMIUM_FLAGS'] = flags
+
+
+configure_rendering(get_config("../config/settings.json"))
 
 from PyQt6.QtWidgets import QApplication, QLabel, QMainWindow, QVBoxLayout, QWidget
-from PyQt6.QtCore import Qt, QPoint, QTimer
+from PyQt6.QtCore import Qt, QEvent, QPoint, QTimer, pyqtSignal
 from PyQt6.QtGui import QPixmap, QPainter, QPen, QColor, QGuiApplication, QMouseEvent
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineProfile
-from PyQt6.QtCore import QUrl
 
-from api_handler import AsyncAPIHandler
-from tts_module import TTSModule
-from stt_module import STTModule
-from config_loader import ConfigLoader
-from live2d_handler import Live2DIntegration, Live2DWebView
+# Everything else (WebEngine, requests/aiohttp, torch, vosk, sounddevice...) is imported on demand,
+# after the window is on screen; see AkronNovaDesktopCharacter.start_subsystems
+from async_bridge import EventLoopBridge, install_bridge
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
@@ -37,28 +77,120 @@ def asset_path(path: str):
     assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets')
     return os.path.join(assets_dir, path)
 
-# print(asset_path('live2d_model.zip'), "Exists " if os.path.exists(asset_path('live2d_model.zip')) else "Doesn't exist")
-
 class AkronNovaDesktopCharacter(QMainWindow):
-    def __init__(self):
+    # Emitted from worker threads; Qt queues them onto the UI thread
+    user_spoke = pyqtSignal(str)
+    user_speaking = pyqtSignal(str)
+    user_paused = pyqtSignal(str)
+    expression_due = pyqtSignal(int, int)  # Expression index, delay in ms
+    speech_started = pyqtSignal()
+    speaking_changed = pyqtSignal(bool)
+    startup_finished = pyqtSignal()
+
+    def __init__(self, defer_startup=True):
         super().__init__()
-        self.config = ConfigLoader("../config/settings.json")
-        self.api_handler = AsyncAPIHandler()
-        self.conversation_history = []
-        
-        # Initialize Live2D integration
-        self.live2d_integration = Live2DIntegration()
+        self.startup = get_startup_timer()
+        self._ready = False
+        with self.startup.phase("config"):
+            self.config = get_config("../config/settings.json")
+
+        with self.startup.phase("window"):
+            self.setup_window()
+            self.load_character_assets()
+            self.setup_interaction_system()
+            self.show_character()
+        self.startup.mark("window_visible")
+
+        # The rest comes up one phase per event loop turn so the window can paint in between
+        self._startup_phases = [
+            ("models", self.start_model_loading),
+            ("api_handler", self.init_api_handler),
+            ("live2d_integration", self.init_live2d_integration),
+            ("speech", self.init_speech),
+            ("wiring", self.connect_signals),
+        ]
+        if defer_startup:
+            QTimer.singleShot(0, self.start_subsystems)
+        else:
+            while self._startup_phases:
+                self.run_startup_phase()
 
-        self.setup_window()
-        self.load_character_assets()
-        self.setup_interaction_system()
-        self.show_character()
+    def start_subsystems(self):
+        """Run the next deferred startup phase, then schedule the one after it"""
+        if self.run_startup_phase():
+            QTimer.singleShot(0, self.start_subsystems)
 
-        self.tts_module = TTSModule
-        self.stt_module = STTModule
+    def run_startup_phase(self):
+        """Run the next startup phase; returns True while more phases remain"""
+        name, init = self._startup_phases.pop(0)
+        with self.startup.phase(name):
+            init()
+        if self._startup_phases:
+            return True
 
-        # self.init_tts_module()
-        # self.init_stt_module()
+        self._ready = True
+        self.startup.mark("ready")
+        self.startup.log_report()
+        self.startup_finished.emit()
+        return False
+
+    def start_model_loading(self):
+        """Heavy models load in parallel in the background; their modules are imported there too"""
+        from model_loader import get_model_loader
+        self.models = get_model_loader()
+        self.models.register("tts", self._create_tts_module, warmup=lambda tts: tts.warm_up())
+        self.models.register("stt", self._create_stt_module, warmup=lambda stt: stt.warm_up())
+        self.models.start("tts", "stt")
+
+    def init_api_handler(self):
+        from api_handler import AsyncAPIHandler
+        self.api_handler = AsyncAPIHandler(load_memory=False)
+        # Scanning the response cache and loading vector memory (and maybe an embedding model) take
+        # a while, so they load in the background with the models
+        self.models.register("response_cache", self.api_handler.create_cache)
+        self.models.register("vector_memory", self.api_handler.create_vector_memory)
+        self.models.when_ready("response_cache", self.api_handler.attach_cache)
+        self.models.when_ready("vector_memory", self.api_handler.attach_vector_memory)
+        # Recent turns live in the API handler's context window; the full log is its conversation store
+        self.conversation_history = self.api_handler.conversation_history
+
+    def init_live2d_integration(self):
+        from live2d_handler import Live2DIntegration
+        self.live2d_integration = Live2DIntegration(self.config.get("live2d.model_name", "香風智乃"))
+        for name in self.config.get("live2d.preload_models", []):
+            self.preload_avatar(name)
+
+    def preload_avatar(self, name):
+        """Parse a model's files and load it in the page in the background"""
+        model = self.live2d_integration.preload_model(name)
+        self.live2d_view.preload_model(model.model3_path)
+
+    def switch_avatar(self, name):
+        """Swap the character's model; instant if it was preloaded"""
+        model = self.live2d_integration.switch_model(name)
+        self.live2d_view.switch_model(model.model3_path)
+        if hasattr(self, 'animation'):
+            self.animation.idle_group = model.idle_motion_group()
+
+    def init_speech(self):
+        from speech_pipeline import SpeechPipeline
+        self.speech_pipeline = SpeechPipeline(self._synthesize_speech, on_chunk_start=self._on_segment_start,
+                                              on_idle=lambda: self.speaking_changed.emit(False))
+        self._active_router = None
+        self._cue_generation = 0  # Bumped on interrupt so pending expression cues are dropped
+        self.setup_lip_sync()
+
+    def connect_signals(self):
+        self.user_spoke.connect(self.on_user_speech)
+        self.user_speaking.connect(self.on_partial_speech)
+        self.user_paused.connect(self.on_speech_endpoint)
+        self.expression_due.connect(self.schedule_emotion)
+        self.speech_started.connect(self.start_lip_sync)
+        self.speaking_changed.connect(self.on_speaking_changed)
+        self.models.when_ready("stt", self.init_stt_module)
+        # Settings read through self.config.get() pick up edits on their own; these are cached here
+        self.config.subscribe(self.on_animation_settings_changed, "animation")
+        self.config.watch()
 
     def setup_window(self):
         """Setup the desktop overlay window"""
@@ -76,8 +208,14 @@ class AkronNovaDesktopCharacter(QMainWindow):
         
     def load_character_assets(self):
         """Load character assets - now using Live2D web view"""
+        from live2d_handler import Live2DWebView
+        from model_registry import get_model_registry
         # Use Live2D web view instead of static image
-        self.live2d_view = Live2DWebView(self)
+        self.live2d_view = Live2DWebView(self, profile=self._create_web_profile())
+        self.live2d_view.configure_rendering(
+            idle_fps=self.config.get("rendering.idle_fps", 15),
+            active_fps=self.config.get("rendering.active_fps", 60)
+        )
 
         # Set up the layout to contain the Live2D view
         central_widget = QWidget(self)
@@ -88,11 +226,82 @@ class AkronNovaDesktopCharacter(QMainWindow):
         layout.addWidget(self.live2d_view)
         # Set initial size for the Live2D view
         self.live2d_view.setFixedSize(400, 500)
+        texture_cache = self._create_texture_cache()
+        self.asset_handler = self._create_asset_handler(texture_cache)
+        if self.asset_handler is not None:
+            self.live2d_view.serve_assets(self.asset_handler)
+        model = get_model_registry().get(self.config.get("live2d.model_name", "香風智乃"))
+        self.live2d_view.load_model(model.model3_path, texture_cache=texture_cache,
+                                    oversample=self.config.get("textures.oversample", 2.0))
+        self._warm_up_assets()
 
         # Keep references to both old and new systems for compatibility
         self.current_widget = self.live2d_view
         print(1)
         
+    def _create_web_profile(self):
+        """Persistent profile for the avatar page, so its storage is reused across launches"""
+        if not self.config.get("webengine.persistent_profile", True):
+            return None
+        from web_profile import create_profile
+        return create_profile(
+            self.config.get("webengine.storage_path", "../data/webengine"),
+            self.config.get("webengine.http_cache_mb", 64),
+            parent=QApplication.instance()  # Must outlive the page
+        )
+
+    def _warm_up_assets(self):
+        """
+        Read the page scripts, the model3.json and its .moc3 in the background while Chromium starts.
+        Only what the page itself fetches is warmed; anything else would sit in memory unread.
+        """
+        if self.asset_handler is None or not self.config.get("webengine.warmup", True):
+            return
+        from live2d_handler import Live2DWebView
+        web_dir = os.path.join(Live2DWebView.ROOT_DIR, "web")
+        files = [os.path.join(web_dir, name) for name in
+                 ("live2dcubismcore.min.js", "live2d.min.js", "live2d-core.js")]
+        model_path = self.live2d_view.model_path
+        if model_path:
+            files.append(model_path)
+            try:
+                with open(model_path, "r", encoding="utf-8") as f:
+                    moc = json.load(f)["FileReferences"].get("Moc")
+                if moc:
+                    files.append(os.path.join(os.path.dirname(model_path), moc))
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping moc warm-up: {e}")
+        paths = [os.path.relpath(path, Live2DWebView.ROOT_DIR).replace(os.sep, "/") for path in files]
+        self.asset_handler.warm(path for path in paths if not path.startswith(".."))
+
+    def _create_texture_cache(self):
+        """Downscaled model textures, so a small window does not decode and upload 4K atlases"""
+        if not self.config.get("textures.enabled", True):
+            return None
+        from texture_variants import TextureVariantCache
+        return TextureVariantCache(
+            self.config.get("textures.cache_dir", "../data/textures"),
+            self.config.get("textures.sizes", [1024, 2048])
+        )
+
+    def _create_asset_handler(self, texture_cache=None):
+        """Serve web/ and assets/ (and the texture cache) over akronnova://, from the asset zip when it is valid"""
+        if not self.config.get("assets.use_scheme", True):
+            return None
+        from asset_scheme import AssetSchemeHandler
+        from live2d_handler import Live2DWebView
+        directories = ["web", "assets"]
+        if texture_cache is not None:
+            relative = os.path.relpath(os.path.abspath(texture_cache.cache_dir), Live2DWebView.ROOT_DIR)
+            if not relative.startswith(".."):
+                directories.append(relative.replace(os.sep, "/"))
+        return AssetSchemeHandler(
+            Live2DWebView.ROOT_DIR,
+            archive_path=self.config.get("assets.archive") or asset_path("live2d_model.zip"),
+            directories=directories,
+            parent=self
+        )
+
     def create_placeholder_image(self):
         """Create a placeholder image for AkronNova"""
         size = 200
@@ -130,23 +339,147 @@ class AkronNovaDesktopCharacter(QMainWindow):
         # Setup mouse event handling
         self.dragging = False
         self.offset = QPoint()
-        
-        # Animation timer
-        self.animation_timer = QTimer(self)
-        self.animation_timer.timeout.connect(self.animate_character)
-        self.animation_timer.start(100)  # Update every 100ms
 
-    def init_tts_module(self):
-        self.tts_module = TTSModule()
-    def init_stt_module(self):
-        self.stt_module = STTModule()
+    def setup_lip_sync(self):
+        """Drive the mouth from each speech chunk's envelope, computed when the chunk is synthesized"""
+        from animation_scheduler import AnimationScheduler
+        from lip_sync import LipSync
+        fps = self.config.get("animation.lip_sync_fps", 30)
+        self.lip_sync = LipSync(self.speech_pipeline.player, frame_rate=fps,
+                                gain=self.config.get("animation.lip_sync_gain", 1.0))
+        if self.config.get("animation.talk_animation_enabled", True):
+            self.speech_pipeline.analyze = self.lip_sync.prepare
+
+        self.animation = AnimationScheduler(
+            self.live2d_view,
+            idle_interval_ms=self.config.get("animation.idle_animation_interval", 5000),
+            # Models without idle motions just blink and lip-sync
+            idle_group=self.live2d_integration.model_entry().idle_motion_group(),
+            blink_enabled=self.config.get("animation.movement_enabled", True),
+            talk_fps=fps,
+            mouth_source=self._mouth_opening,
+            parent=self
+        )
+        self.update_visibility()
+
+    def on_animation_settings_changed(self, changed):
+        """Apply edited animation settings without a restart; runs on the config watcher thread"""
+        self.animation.idle_interval_ms = self.config.get("animation.idle_animation_interval", 5000)
+        self.animation.blink_enabled = self.config.get("animation.movement_enabled", True)
+        self.lip_sync.gain = self.config.get("animation.lip_sync_gain", 1.0)
+
+    def _mouth_opening(self):
+        """Mouth opening for the audio being heard right now, or None once speech is over"""
+        if not self.speech_pipeline.player.is_playing and not self.speech_pipeline.is_busy:
+            self.lip_sync.stop()
+            return None
+        return self.lip_sync.value()
+
+    def start_lip_sync(self):
+        if self.lip_sync.active:
+            self.animation.start_talking()
+
+    def stop_lip_sync(self):
+        self.lip_sync.stop()
+        self.animation.stop_talking()
+
+    def on_speaking_changed(self, speaking):
+        """Render at the active frame rate only while speech audio is playing"""
+        self.live2d_view.set_render_active("speech", speaking)
+
+    @property
+    def tts_module(self):
+        """Shared TTS model; blocks until the background load finishes"""
+        return self.models.get("tts")
+
+    @property
+    def stt_module(self):
+        """Shared STT model; blocks until the background load finishes"""
+        return self.models.get("stt")
+
+    def _synthesize_speech(self, text):
+        """Synthesize one chunk of speech in memory; runs on the speech pipeline's worker thread"""
+        from response_cache import cache_key, decode_pcm, encode_pcm
+        tts_server = self.config.get("api_endpoints.tts_server", "internal")
+        cache = self.api_handler.cache
+        key = None
+        if cache is not None:
+            if tts_server == "internal":
+                from tts_module import TTSModule
+                key = cache_key("tts", text, TTSModule.MODEL_ID, TTSModule.SPEAKER, TTSModule.SAMPLE_RATE)
+            else:
+                key = cache_key("tts", text, tts_server, "default")
+            cached = cache.get(key)
+            if cached is not None:
+                return decode_pcm(cached)
+
+        if tts_server != "internal":
+            result = self.api_handler.call_tts_pcm(text)
+            if result is None:
+                raise RuntimeError("TTS server returned no audio")
+        else:
+            tts = self.tts_module
+            result = tts.synth(text), tts.sample_rate
+
+        if key is not None:
+            cache.put(key, encode_pcm(*result))
+        return result
+
+    def _create_tts_module(self):
+        from tts_module import TTSModule
+        return TTSModule()
+
+    def _create_stt_module(self):
+        from stt_module import STTModule
+        return STTModule(
+            model_path=self.config.get("voice.model_path", "../voice/en-us-0.22-lgraph"),
+            vad=self.config.get("voice.vad", "energy"),
+            vad_aggressiveness=self.config.get("voice.vad_aggressiveness", 2),
+            endpoint_ms=self.config.get("voice.endpoint_ms", 300),
+            silence_ms=self.config.get("voice.silence_ms", 800)
+        )
+
+    def init_stt_module(self, stt_module):
+        """Start background recognition once the STT model has loaded; the mic opens if voice input is enabled"""
+        stt_module.start_service(
+            on_utterance=self.user_spoke.emit,
+            on_partial=self.user_speaking.emit,
+            on_endpoint=self.user_paused.emit
+        )
+        if self.config.get("voice.enabled", True):
+            stt_module.start()
+
+    def on_partial_speech(self, text):
+        """The user is still talking; show what has been heard so far"""
+        logging.debug(f"Hearing: {text}")
+
+    def on_speech_endpoint(self, text):
+        """The user paused: let the LLM process the likely prompt while the utterance is finalized"""
+        if self.config.get("voice.speculative_prefill", True):
+            self.api_handler.prefill_async(text)
+
+    def on_user_speech(self, text):
+        """Answer a recognized utterance, speaking the reply as it streams in"""
+        self.interrupt()
+        router = self._start_reply()
+
+        def _on_delta(delta):
+            if router is self._active_router:
+                router.feed(delta)
+
+        def _on_done(reply):
+            if reply is not None and router is self._active_router:
+                router.finish()
+
+        self.api_handler.call_llm_stream_async(text, on_delta=_on_delta, callback=_on_done)
 
     def mousePressEvent(self, event):
         """Handle mouse press for dragging and interaction"""
         if event.button() == Qt.MouseButton.LeftButton:
             self.dragging = True
             self.offset = event.pos()
-        elif event.button() == Qt.MouseButton.RightButton:
+            self.live2d_view.set_render_active("drag", True)
+        elif event.button() == Qt.MouseButton.RightButton and self._ready:
             # Right click could trigger conversation
             self.start_conversation()
             
@@ -159,6 +492,7 @@ class AkronNovaDesktopCharacter(QMainWindow):
     def mouseReleaseEvent(self, event):
         """Handle mouse release"""
         self.dragging = False
+        self.live2d_view.set_render_active("drag", False)
         
     def show_character(self):
         """Position and show the character on screen"""
@@ -170,44 +504,104 @@ class AkronNovaDesktopCharacter(QMainWindow):
         self.setGeometry(x, y, 400, 500)
         self.show()
         
-    def animate_character(self):
-        """Live2D animation for idle state"""
-        # This now properly handles Live2D animations through the web view
-        # In a real implementation, this would send animation commands to the Live2D model
-        pass
-        
+    def update_visibility(self, visible=None):
+        """Pause animation and suspend rendering while the window is hidden or minimized"""
+        if visible is None:
+            visible = self.isVisible() and not self.isMinimized()
+        if hasattr(self, 'live2d_view'):
+            self.live2d_view.set_render_visible(visible)
+        if hasattr(self, 'animation'):
+            self.animation.set_visible(visible)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_visibility()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_visibility(False)
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_visibility()
+
+    def interrupt(self):
+        """Cut AkronNova off: cancel pending requests and stop speaking"""
+        self._active_router = None
+        self._cue_generation += 1
+        self.api_handler.cancel_all()
+        self.speech_pipeline.stop()
+        self.stop_lip_sync()
+        self.on_speaking_changed(False)
+
     def start_conversation(self):
         """Start a conversation with AkronNova"""
         print("Starting conversation with AkronNova...")
+        self.interrupt()
         # In a real implementation, this would capture voice input or show a text input
         # For now, we'll simulate a simple conversation with emotion tags
         self.talk_to_user("Hey-y+o I'm Akr+onNov+a, your cute e-g+irl. [joy] How about dreaming about a jooo+oob or cons+uming som+e ice cr+eam??")
         
+    def _start_reply(self):
+        """Route a new reply: segments go to the speech pipeline with the expression they carry"""
+        from speech_pipeline import SpeechRouter
+        self._active_router = SpeechRouter(
+            self.live2d_integration.create_emotion_parser(), self._route_segment
+        )
+        return self._active_router
+
+    def _route_segment(self, text, cues):
+        if text:
+            self.speech_pipeline.feed(text, cues)
+        elif cues:
+            # Fires after the sentences queued before it have played
+            self.speech_pipeline.mark(cues)
+
+    def _on_segment_start(self, text, cues, envelope, duration):
+        """A segment starts playing; runs on the playback thread"""
+        if text:
+            self.speaking_changed.emit(True)
+        for fraction, expression in cues or ():
+            # Tags mid-sentence land roughly where they were in the text
+            self.expression_due.emit(expression, int(fraction * duration * 1000))
+        if envelope is not None:
+            self.lip_sync.start(envelope)
+            self.speech_started.emit()
+
+    def schedule_emotion(self, emotion_index, delay_ms):
+        """Apply an expression after delay_ms, unless AkronNova is interrupted first"""
+        if delay_ms <= 0:
+            self.apply_emotion(emotion_index)
+            return
+        generation = self._cue_generation
+
+        def _apply():
+            if generation == self._cue_generation:
+                self.apply_emotion(emotion_index)
+        QTimer.singleShot(delay_ms, _apply)
+
+    def apply_emotion(self, emotion_index):
+        """Switch the Live2D expression"""
+        self.live2d_integration.set_emotion(emotion_index)
+        print(f"Applied emotion index: {emotion_index}")
+        if hasattr(self, 'live2d_view'):
+            self.live2d_view.set_emotion(emotion_index)
+
     def talk_to_user(self, message):
         """Make AkronNova speak to the user"""
         print(f"AkronNova says: {message}")
         
-        # Process the message for emotions and update Live2D model
-        emotions, clean_message = self.live2d_integration.process_text_for_emotions(message)
-        if emotions:
-            # Set the first emotion found, or default to neutral (0)
-            emotion_index = emotions[0] if emotions else 0
-            self.live2d_integration.set_emotion(emotion_index)
-            print(f"Applied emotion index: {emotion_index}")
-            
-            # Update the Live2D model in the web view
-            if hasattr(self, 'live2d_view'):
-                self.live2d_view.set_emotion(emotion_index)
-        
-        # Speak the clean message (without emotion tags)
-        self.tts_module.synth(text=str(clean_message))
+        # Every emotion tag switches the expression when the sentence it belongs to starts playing
+        router = self._start_reply()
+        router.feed(str(message))
+        router.finish()
             
     def get_llm_response(self, user_input):
         """Get response from LLM system"""
         try:
             response = self.api_handler.chat(user_input)
             if response:
-                self.conversation_history.append({"user": user_input, "akronnova": response})
                 return response
             else:
                 return "I'm having trouble connecting to my brain right now."
@@ -220,16 +614,43 @@ class AkronNovaDesktopCharacter(QMainWindow):
         # This would switch between different Live2D animations/models
         pass
 
+    def closeEvent(self, event):
+        """Stop background speech, requests and model loads before the window goes away"""
+        if hasattr(self, 'models'):
+            self.models.shutdown()
+        if hasattr(self, 'api_handler'):
+            self.api_handler.cancel_all()
+        if hasattr(self, 'speech_pipeline'):
+            self.speech_pipeline.shutdown()
+        if hasattr(self, 'api_handler'):
+            self.api_handler.close()
+        super().closeEvent(event)
+
+
+def prepare_qt():
+    """Setup that has to happen before the QApplication is created"""
+    with get_startup_timer().phase("qt_webengine_import"):
+        # QtWebEngine has to be loaded before the QApplication is created
+        import PyQt6.QtWebEngineWidgets  # noqa: F401
+        # Custom schemes are only honoured if declared before the QApplication exists
+        from asset_scheme import register_scheme
+        register_scheme()
+
 
 def main():
-    app = QApplication(sys.argv)
+    startup = get_startup_timer()
+    prepare_qt()
+    with startup.phase("qt_application"):
+        app = QApplication(sys.argv)
+        # Network coroutines share the Qt event loop (via qasync when available)
+        bridge = install_bridge(EventLoopBridge.for_qt(app))
     pet = AkronNovaDesktopCharacter()
     
     # Set application properties
     app.setApplicationName("AkronNova")
     app.setApplicationVersion("0.2")
     
-    sys.exit(app.exec())
+    sys.exit(bridge.run(app))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,139 @@
+"""
+Model Loader for AkronNova
+Loads heavy models (STT, TTS) in parallel in the background and shares one instance of each
+"""
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+WARMING_UP = "warming_up"
+READY = "ready"
+FAILED = "failed"
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+class _ModelEntry:
+    def __init__(self, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]]):
+        self.factory = factory
+        self.warmup = warmup
+        self.state = PENDING
+        self.future: Optional[Future] = None
+        self.load_seconds = 0.0
+        self.warmup_seconds = 0.0
+
+
+class ModelLoader:
+    """
+    Registry of named models. start() loads them concurrently (at most max_workers at a time) and
+    runs a warm-up inference on each; get() returns the shared instance, waiting for it if needed.
+    Loads run on daemon threads, so quitting never waits for a model that is still loading.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._slots = threading.Semaphore(max_workers)
+        self._closed = False
+        self._entries: Dict[str, _ModelEntry] = {}
+        self._lock = threading.Lock()
+        self.on_state_change: Optional[Callable[[str, str], None]] = None
+
+    def register(self, name: str, factory: Callable[[], Any], warmup: Optional[Callable[[Any], None]] = None):
+        """Register how to build a model; registering a known name again keeps the existing entry"""
+        with self._lock:
+            if name not in self._entries:
+                self._entries[name] = _ModelEntry(factory, warmup)
+
+    def start(self, *names: str):
+        """Begin loading the named models (all registered models if none are given) in the background"""
+        with self._lock:
+            for name in names or list(self._entries):
+                entry = self._entries[name]
+                if entry.future is None:
+                    entry.future = Future()
+                    threading.Thread(target=self._run, args=(name, entry),
+                                     name=f"model-loader-{name}", daemon=True).start()
+
+    def shutdown(self):
+        """Cancel loads that have not started; ones in progress are abandoned with their threads"""
+        self._closed = True
+        with self._lock:
+            for entry in self._entries.values():
+                if entry.future is not None:
+                    entry.future.cancel()
+
+    def _run(self, name: str, entry: _ModelEntry):
+        with self._slots:
+            if self._closed or not entry.future.set_running_or_notify_cancel():
+                return
+            try:
+                entry.future.set_result(self._load(name, entry))
+            except Exception as e:
+                entry.future.set_exception(e)
+
+    def _set_state(self, name: str, entry: _ModelEntry, state: str):
+        entry.state = state
+        if self.on_state_change:
+            self.on_state_change(name, state)
+
+    def _load(self, name: str, entry: _ModelEntry):
+        self._set_state(name, entry, LOADING)
+        start = time.perf_counter()
+        try:
+            instance = entry.factory()
+            entry.load_seconds = time.perf_counter() - start
+            if entry.warmup:
+                self._set_state(name, entry, WARMING_UP)
+                start = time.perf_counter()
+                entry.warmup(instance)
+                entry.warmup_seconds = time.perf_counter() - start
+        except Exception as e:
+            logger.error(f"Failed to load model {name}: {e}")
+            self._set_state(name, entry, FAILED)
+            raise
+        logger.info(f"Model {name} ready (load {entry.load_seconds:.2f}s, warm-up {entry.warmup_seconds:.2f}s)")
+        self._set_state(name, entry, READY)
+        return instance
+
+    def get(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Return the shared instance, starting the load if needed and blocking until it is ready"""
+        self.start(name)
+        return self._entries[name].future.result(timeout)
+
+    def when_ready(self, name: str, callback: Callable[[Any], None]):
+        """Call callback with the instance once it is ready (from the loader thread, or immediately)"""
+        self.start(name)
+
+        def _done(future: Future):
+            if not future.cancelled() and future.exception() is None:
+                callback(future.result())
+
+        self._entries[name].future.add_done_callback(_done)
+
+    def state(self, name: str) -> str:
+        entry = self._entries.get(name)
+        return entry.state if entry else PENDING
+
+    def is_ready(self, name: str) -> bool:
+        return self.state(name) == READY
+
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {"load": entry.load_seconds, "warmup": entry.warmup_seconds}
+            for name, entry in self._entries.items()
+        }
+
+
+def get_model_loader() -> ModelLoader:
+    """Return the process-wide model loader"""
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            _loader = ModelLoader()
+        return _loader
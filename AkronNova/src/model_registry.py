@@ -0,0 +1,174 @@
+"""
+Model Registry for AkronNova
+Parses model_dict.json and each model's model3/exp3/physics3 files once, indexes them by name and
+re-reads a file only when its mtime changes
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_registries: Dict[str, "ModelRegistry"] = {}
+_registries_lock = threading.Lock()
+
+_ENCODINGS = ("utf-8-sig", "gbk", "gb2312")
+
+
+def decode_text(raw: bytes, name: str = "file") -> str:
+    """
+    Decode file contents that may not be UTF-8, trying common encodings on the bytes already in
+    memory before falling back to chardet.
+    """
+    for encoding in _ENCODINGS:  # utf-8-sig also reads plain UTF-8 and ASCII
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+
+    import chardet  # Only needed for files none of the common encodings can read
+    detected = chardet.detect(raw)["encoding"]
+    if detected:
+        try:
+            return raw.decode(detected)
+        except UnicodeDecodeError:
+            pass
+    raise UnicodeError(f"Failed to decode {name} with any encoding")
+
+
+class _CachedJSON:
+    """One parsed JSON file, re-read only when its mtime or size changes"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._stamp = None
+        self._value = None
+
+    def _current_stamp(self):
+        stat = os.stat(self.path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self) -> Any:
+        stamp = self._current_stamp()
+        if stamp != self._stamp:
+            with open(self.path, "rb") as f:
+                self._value = json.loads(decode_text(f.read(), self.path))
+            self._stamp = stamp
+        return self._value
+
+
+class ModelEntry:
+    """Everything known about one model: its model_dict entry and its parsed Cubism files"""
+
+    def __init__(self, info: dict, model3_path: str):
+        self.info = info
+        self.name = info["name"]
+        self.model3_path = model3_path
+        self.model_dir = os.path.dirname(model3_path)
+        self._model3 = _CachedJSON(model3_path)
+        self._files: Dict[str, _CachedJSON] = {}
+
+    def _json(self, relative_path: str) -> Any:
+        path = os.path.join(self.model_dir, relative_path)
+        cached = self._files.get(path)
+        if cached is None:
+            cached = self._files[path] = _CachedJSON(path)
+        return cached.get()
+
+    @property
+    def model3(self) -> dict:
+        return self._model3.get()
+
+    @property
+    def expressions(self) -> Dict[str, dict]:
+        """Expression name -> parsed exp3.json, from the model3.json or the model directory"""
+        references = self.model3.get("FileReferences", {}).get("Expressions")
+        if references is None:
+            references = [
+                {"Name": f[:-len(".exp3.json")], "File": f}
+                for f in sorted(os.listdir(self.model_dir)) if f.endswith(".exp3.json")
+            ]
+        return {ref["Name"]: self._json(ref["File"]) for ref in references}
+
+    @property
+    def motion_groups(self) -> List[str]:
+        """Motion group names declared in the model3.json"""
+        return list(self.model3.get("FileReferences", {}).get("Motions", {}))
+
+    def idle_motion_group(self) -> Optional[str]:
+        """The model_dict idle group if the model has motions for it, else None"""
+        group = self.info.get("idleMotionGroupName", "Idle")
+        return group if group in self.motion_groups else None
+
+    @property
+    def physics(self) -> Optional[dict]:
+        physics = self.model3.get("FileReferences", {}).get("Physics")
+        return self._json(physics) if physics else None
+
+    def preload(self):
+        """Parse every file now so later lookups are served from memory"""
+        self.model3
+        self.expressions
+        self.physics
+
+
+class ModelRegistry:
+    """
+    Name-indexed view of model_dict.json. Model URLs in the dictionary are relative to the
+    dictionary's directory. Lookups only stat the dictionary; it is re-parsed when it changes.
+    """
+
+    def __init__(self, model_dict_path: str):
+        self.model_dict_path = os.path.abspath(model_dict_path)
+        self.root_dir = os.path.dirname(self.model_dict_path)
+        self._dict = _CachedJSON(self.model_dict_path)
+        self._dict_value = None
+        self._index: Dict[str, ModelEntry] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self) -> Dict[str, ModelEntry]:
+        with self._lock:
+            models = self._dict.get()
+            if models is not self._dict_value:
+                previous = self._index
+                index = {}
+                for info in models:
+                    entry = previous.get(info["name"])
+                    model3_path = os.path.normpath(os.path.join(self.root_dir, info["url"]))
+                    if entry is None or entry.model3_path != model3_path:
+                        entry = ModelEntry(info, model3_path)
+                    entry.info = info
+                    index[info["name"]] = entry
+                self._index = index
+                self._dict_value = models
+                logger.info(f"Indexed {len(index)} Live2D models from {self.model_dict_path}")
+            return self._index
+
+    def names(self) -> List[str]:
+        return list(self._refresh())
+
+    def get(self, name: str) -> ModelEntry:
+        entry = self._refresh().get(name)
+        if entry is None:
+            raise KeyError(f"{name} not found in model dictionary {self.model_dict_path}.")
+        return entry
+
+    def info(self, name: str) -> dict:
+        """The model's entry in model_dict.json"""
+        return self.get(name).info
+
+    def preload(self, name: str) -> ModelEntry:
+        entry = self.get(name)
+        entry.preload()
+        return entry
+
+
+def get_model_registry(model_dict_path: str = "../model_dict.json") -> ModelRegistry:
+    """Return the process-wide registry for a model dictionary"""
+    key = os.path.abspath(model_dict_path)
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ModelRegistry(model_dict_path)
+        return _registries[key]
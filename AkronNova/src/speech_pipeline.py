@@ -0,0 +1,291 @@
+"""
+Speech Pipeline for AkronNova
+Splits replies into sentences and overlaps synthesis of the next chunk with playback of the current one
+"""
+import logging
+import queue
+import re
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from audio_player import AudioPlayer
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_END = re.compile(r'(?<=[.!?…。！？])["\')\]]*\s+')
+_CLAUSE_END = re.compile(r'(?<=[,;:，；：])\s+')
+_SPACE_BEFORE_PUNCTUATION = re.compile(r'\s+(?=[.,!?;:…。！？，；：])')
+_WORD = re.compile(r'\w')
+# A period after these is not the end of a sentence
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "e.g", "i.e", "no", "approx"}
+
+
+def _sentence_ends(text: str, start: int = 0):
+    """End offsets (after the trailing whitespace) of the sentences in text, skipping abbreviations"""
+    for match in _SENTENCE_END.finditer(text, start):
+        head = text[:match.start()]
+        if head.endswith("."):
+            words = head[:-1].split()
+            if words and words[-1].lstrip("(\"'").lower() in _ABBREVIATIONS:
+                continue
+        yield match.end()
+
+
+def _normalize(text: str) -> str:
+    """Collapse whitespace, including the gaps left where tags were stripped"""
+    return _SPACE_BEFORE_PUNCTUATION.sub("", " ".join(text.split()))
+
+
+def split_sentences(text: str, max_chars: int = 200) -> List[str]:
+    """
+    Split text into sentences for synthesis.
+    Sentences longer than max_chars are further split at clause punctuation.
+    """
+    chunks = []
+    text = text.strip()
+    last = 0
+    sentences = []
+    for end in _sentence_ends(text):
+        sentences.append(text[last:end])
+        last = end
+    sentences.append(text[last:])
+    for sentence in sentences:
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+
+        current = ""
+        for clause in _CLAUSE_END.split(sentence):
+            if current and len(current) + len(clause) + 1 > max_chars:
+                chunks.append(current)
+                current = clause
+            else:
+                current = f"{current} {clause}" if current else clause
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+class SpeechRouter:
+    """
+    Turns streamed LLM text into speech segments as the reply unfolds.
+    Segments are whole sentences (long ones split at clauses; ones with fewer than min_chars
+    letters are merged into the next), so synthesis keeps natural prosody. Emotion tags are stripped as they
+    arrive and only time the expression: on_segment receives (text, cues), where each cue is
+    (fraction of the segment's text before the tag, expression index). text is empty for tags
+    left at the very end of a reply.
+    """
+
+    def __init__(self, parser, on_segment: Callable[[str, List[Tuple[float, int]]], None],
+                 max_chars: int = 200, min_chars: int = 8):
+        self.parser = parser
+        self.parser.reset()
+        self.on_segment = on_segment
+        self.max_chars = max_chars
+        self.min_chars = min_chars
+        self._buffer = ""
+        self._buffer_start = 0  # Stream position of self._buffer[0]
+        self._tags: List[Tuple[int, int]] = []
+
+    def feed(self, delta: str):
+        """Consume the next text delta, emitting every segment it completes"""
+        tags, clean = self.parser.feed(delta)
+        self._tags.extend(tags)
+        self._buffer += clean
+
+        while True:
+            end = next((e for e in _sentence_ends(self._buffer)
+                        if len(_WORD.findall(self._buffer[:e])) >= self.min_chars), None)
+            if end is not None:
+                self._emit(end)
+                continue
+            if len(self._buffer) <= self.max_chars:
+                return
+            clauses = [m.end() for m in _CLAUSE_END.finditer(self._buffer, 0, self.max_chars)]
+            if not clauses:
+                return
+            self._emit(clauses[-1])
+
+    def finish(self):
+        """End of the reply: emit whatever is left"""
+        tags, clean = self.parser.flush()
+        self._tags.extend(tags)
+        self._buffer += clean
+        self._emit(len(self._buffer), final=True)
+
+    def _emit(self, end: int, final: bool = False):
+        raw = self._buffer[:end]
+        segment_end = self._buffer_start + end
+        tags = [(position - self._buffer_start, index) for position, index in self._tags
+                if position < segment_end or final]
+        self._tags = [(position, index) for position, index in self._tags
+                      if not (position < segment_end or final)]
+        self._buffer = self._buffer[end:]
+        self._buffer_start = segment_end
+
+        text = _normalize(raw)
+        if not _WORD.search(text):
+            # Nothing to say (e.g. stray punctuation): keep the tags for later, or fire them last
+            if final and tags:
+                self.on_segment("", [(1.0, index) for _, index in tags])
+            elif tags:
+                self._tags = [(self._buffer_start, index) for _, index in tags] + self._tags
+            return
+        cues = [(min(1.0, len(_normalize(raw[:offset])) / len(text)), index) for offset, index in tags]
+        self.on_segment(text, cues)
+
+
+class SpeechPipeline:
+    """
+    Two-stage speech engine: a synthesis worker turns text chunks into audio while a playback
+    worker plays the previous chunk. A bounded queue between the stages keeps synthesis at most
+    max_pending chunks ahead of playback.
+    analyze, if given, runs on the synthesis thread for each chunk's audio (e.g. a lip-sync
+    envelope); its result is the third argument of on_chunk_start, the chunk's duration in seconds
+    the fourth.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Tuple[np.ndarray, int]],
+                 player: Optional[AudioPlayer] = None, max_pending: int = 2,
+                 on_chunk_start: Optional[Callable[[str, Any, Any, float], None]] = None,
+                 on_idle: Optional[Callable[[], None]] = None,
+                 analyze: Optional[Callable[[np.ndarray, int], Any]] = None):
+        self.synthesize = synthesize
+        self.player = player or AudioPlayer()
+        self.analyze = analyze
+        self.on_chunk_start = on_chunk_start
+        self.on_idle = on_idle
+
+        self._text_queue = queue.Queue()
+        self._audio_queue = queue.Queue(maxsize=max_pending)
+        self._generation = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._running = True
+
+        self._synth_thread = threading.Thread(target=self._synth_worker, daemon=True)
+        self._play_thread = threading.Thread(target=self._play_worker, daemon=True)
+        self._synth_thread.start()
+        self._play_thread.start()
+
+    @property
+    def is_busy(self) -> bool:
+        return self._pending > 0
+
+    def speak(self, text: str, tag: Any = None):
+        """Split text into sentences and queue them for synthesis"""
+        for chunk in split_sentences(text):
+            self.feed(chunk, tag)
+
+    def feed(self, chunk: str, tag: Any = None):
+        """
+        Queue a single chunk as-is.
+        tag is passed back through on_chunk_start when the chunk starts playing.
+        """
+        if not chunk.strip():
+            return
+        with self._lock:
+            self._pending += 1
+            self._text_queue.put((self._generation, chunk, tag))
+
+    def mark(self, tag: Any):
+        """
+        Queue a silent marker: on_chunk_start("", tag, None, 0.0) is called once everything queued
+        before it has played, e.g. for an emotion tag at the very end of a reply.
+        """
+        with self._lock:
+            self._pending += 1
+            self._text_queue.put((self._generation, "", tag))
+
+    def stop(self):
+        """Drop everything queued and interrupt the current playback"""
+        with self._lock:
+            self._generation += 1
+            self._drain(self._text_queue)
+            self._drain(self._audio_queue)
+            self._pending = 0
+        self.player.stop()
+
+    def shutdown(self):
+        """Stop the pipeline and its worker threads"""
+        self._running = False
+        self.stop()
+        self._text_queue.put(None)
+        try:
+            self._audio_queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    @staticmethod
+    def _drain(q: queue.Queue):
+        while True:
+            try:
+                q.get_nowait()
+            except queue.Empty:
+                return
+
+    def _synth_worker(self):
+        while self._running:
+            item = self._text_queue.get()
+            if item is None:
+                return
+            generation, chunk, tag = item
+            if generation != self._generation:
+                continue
+            if not chunk:
+                self._audio_queue.put((generation, chunk, tag, None, None, 0))
+                continue
+
+            try:
+                samples, sample_rate = self.synthesize(chunk)
+            except Exception as e:
+                logger.error(f"Speech synthesis failed for {chunk!r}: {e}")
+                self._chunk_done(generation)
+                continue
+
+            analysis = None
+            if self.analyze:
+                try:
+                    analysis = self.analyze(samples, sample_rate)
+                except Exception as e:
+                    logger.error(f"Speech analysis failed for {chunk!r}: {e}")
+
+            # Blocks while playback is max_pending chunks behind
+            self._audio_queue.put((generation, chunk, tag, analysis, samples, sample_rate))
+
+    def _play_worker(self):
+        while self._running:
+            item = self._audio_queue.get()
+            if item is None:
+                return
+            generation, chunk, tag, analysis, samples, sample_rate = item
+            with self._lock:
+                if generation != self._generation:
+                    continue
+
+            if self.on_chunk_start:
+                duration = len(samples) / sample_rate if samples is not None else 0.0
+                self.on_chunk_start(chunk, tag, analysis, duration)
+            if samples is not None:
+                try:
+                    # Re-checked as the stream starts: a stop() after the check above must not
+                    # let this chunk play
+                    self.player.play(samples, sample_rate,
+                                     should_play=lambda: generation == self._generation)
+                except Exception as e:
+                    logger.error(f"Audio playback failed: {e}")
+            self._chunk_done(generation)
+
+    def _chunk_done(self, generation: int):
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pending -= 1
+            idle = self._pending == 0
+        if idle and self.on_idle:
+            self.on_idle()
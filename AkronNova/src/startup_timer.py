@@ -0,0 +1,60 @@
+"""
+Startup Timer for AkronNova
+Records how long each startup phase takes, measured from process start
+"""
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+_timer = None
+_timer_lock = threading.Lock()
+
+
+class StartupTimer:
+    """
+    Collects named phases (with their duration) and milestones (a point in time) relative to the
+    origin, which is when this module was first imported.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.phases: List[Dict[str, float]] = []
+        self.milestones: Dict[str, float] = {}
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self.origin
+
+    @contextmanager
+    def phase(self, name: str):
+        start = self._elapsed()
+        try:
+            yield
+        finally:
+            end = self._elapsed()
+            self.phases.append({"name": name, "start": start, "seconds": end - start})
+
+    def mark(self, name: str):
+        """Record a milestone such as the window becoming visible"""
+        self.milestones[name] = self._elapsed()
+
+    def report(self) -> dict:
+        return {"phases": list(self.phases), "milestones": dict(self.milestones)}
+
+    def log_report(self):
+        lines = [f"  {p['name']:<24} {p['seconds'] * 1000:8.1f} ms  (at {p['start'] * 1000:.0f} ms)"
+                 for p in self.phases]
+        lines += [f"  {name:<24} at {at * 1000:.0f} ms" for name, at in self.milestones.items()]
+        logger.info("Startup timing:\n" + "\n".join(lines))
+
+
+def get_startup_timer() -> StartupTimer:
+    """Return the process-wide startup timer"""
+    global _timer
+    with _timer_lock:
+        if _timer is None:
+            _timer = StartupTimer()
+        return _timer
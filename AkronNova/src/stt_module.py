@@ -1,49 +1,226 @@
 import vosk
 import sounddevice as sd
+import numpy as np
 import queue
 import json
+import threading
+import time
+from collections import deque
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+
+class EnergyVAD:
+    """Voice activity detection by block RMS against an adaptive noise floor"""
+    def __init__(self, min_rms=300.0, margin=3.0, adapt_rate=0.05):
+        self.min_rms = min_rms
+        self.margin = margin
+        self.adapt_rate = adapt_rate
+        self.noise_floor = min_rms / margin
+
+    def is_speech(self, block: bytes) -> bool:
+        samples = np.frombuffer(block, dtype=np.int16).astype(np.float32)
+        if samples.size == 0:
+            return False
+        rms = float(np.sqrt(np.mean(samples * samples)))
+        speech = rms > max(self.min_rms, self.noise_floor * self.margin)
+        if not speech:
+            self.noise_floor += self.adapt_rate * (rms - self.noise_floor)
+        return speech
+
+
+class WebRTCVAD:
+    """Voice activity detection with the WebRTC GMM classifier over 20 ms frames"""
+    def __init__(self, samplerate, aggressiveness=2, frame_ms=20):
+        self.vad = webrtcvad.Vad(aggressiveness)
+        self.samplerate = samplerate
+        self.frame_bytes = samplerate * frame_ms // 1000 * 2
+
+    def is_speech(self, block: bytes) -> bool:
+        frames = [block[i:i + self.frame_bytes] for i in range(0, len(block) - self.frame_bytes + 1, self.frame_bytes)]
+        if not frames:
+            return False
+        voiced = sum(self.vad.is_speech(frame, self.samplerate) for frame in frames)
+        return voiced * 2 >= len(frames)
+
+
+def create_vad(kind, samplerate, aggressiveness=2):
+    if kind == "webrtc":
+        if webrtcvad is not None:
+            return WebRTCVAD(samplerate, aggressiveness)
+        print("webrtcvad is not installed, using the energy VAD.")
+    return EnergyVAD()
+
 
 class STTModule:
-    def __init__(self):
-        self.model = vosk.Model("../voice/en-us-0.22-lgraph") # Take the models from kr37t1k/deepseekakronvoice or from http://alphacephei.com/
+    DEVICE_RETRY_S = 5.0
+
+    def __init__(self, model_path="../voice/en-us-0.22-lgraph", vad="energy", vad_aggressiveness=2,
+                 block_ms=100, preroll_ms=300, endpoint_ms=300, silence_ms=800):
+        self.model = vosk.Model(model_path) # Take the models from kr37t1k/deepseekakronvoice or from http://alphacephei.com/
         print('Speech-to-text module initialized.')
         self.samplerate = 16000
+        self.blocksize = self.samplerate * block_ms // 1000
+        self.preroll_blocks = max(1, preroll_ms // block_ms)
+        self.endpoint_blocks = max(1, endpoint_ms // block_ms)
+        self.hangover_blocks = max(self.endpoint_blocks, silence_ms // block_ms)
+        self.vad = create_vad(vad, self.samplerate, vad_aggressiveness)
         self.audio_queue = queue.Queue()
-        self.enabled = False
+        self.utterances = queue.Queue()
+        self.on_utterance = None
+        self.on_partial = None
+        self.on_endpoint = None
+        self._enabled = threading.Event()
+        self._service = None
+        self._device_error = None
+
+    def warm_up(self):
+        """Decode half a second of silence so the recognizer graph is paged in before first use"""
+        recognizer = vosk.KaldiRecognizer(self.model, self.samplerate)
+        recognizer.AcceptWaveform(bytes(self.samplerate))
+        recognizer.FinalResult()
+
+    @property
+    def enabled(self):
+        return self._enabled.is_set()
+
     def _callback(self, indata, frames, time, status):
         if status:
             print(f"Audio status: {status}")
         self.audio_queue.put(bytes(indata))
 
     def stop(self):
-        self.enabled = False
+        self._enabled.clear()
         print("STT Module state disabled now.")
     def start(self):
-        self.enabled = True
+        self._enabled.set()
         print("STT Module state enabled now.")
-    def recognize(self):
-        with sd.RawInputStream(
+
+    def start_service(self, on_utterance=None, on_partial=None, on_endpoint=None):
+        """
+        Run continuous recognition on a background thread.
+        Every utterance is passed to on_utterance (from the service thread), or put on self.utterances
+        for recognize() when there is no callback.
+        on_partial receives each new partial hypothesis while the user speaks. on_endpoint receives the
+        current hypothesis as soon as the user pauses (endpoint_ms of silence), before the utterance is
+        finalized after silence_ms, so callers can start work speculatively.
+        The microphone is only open while the module is enabled; otherwise the thread sleeps on an event.
+        """
+        self.on_utterance = on_utterance
+        self.on_partial = on_partial
+        self.on_endpoint = on_endpoint
+        if self._service is None:
+            self._service = threading.Thread(target=self._service_loop, name="stt-service", daemon=True)
+            self._service.start()
+
+    def _service_loop(self):
+        while True:
+            self._enabled.wait()
+            try:
+                opened = self._capture(self._emit)
+            except Exception as e:
+                print(f"STT service error: {e}")
+                opened = False
+            if opened is False:
+                # Device missing or busy: try again later instead of spinning
+                time.sleep(self.DEVICE_RETRY_S)
+
+    def _emit(self, text):
+        print(f"🎤 You: {text}")
+        if self.on_utterance:
+            self.on_utterance(text)
+        else:
+            self.utterances.put(text)
+        return True
+
+    def _capture(self, handle_utterance):
+        """
+        Capture audio while enabled, passing each recognized utterance to handle_utterance.
+        Silence is gated by the VAD so Vosk only decodes speech; returns when disabled or when
+        handle_utterance returns False. Returns False without capturing if the microphone cannot be opened.
+        """
+        recognizer = vosk.KaldiRecognizer(self.model, self.samplerate)
+        preroll = deque(maxlen=self.preroll_blocks)
+        in_speech = False
+        silent_blocks = 0
+        partial = ""
+
+        self.audio_queue = queue.Queue()
+        try:
+            stream = sd.RawInputStream(
                 samplerate=self.samplerate,
-                blocksize=8000,
+                blocksize=self.blocksize,
                 dtype='int16',
                 channels=1,
                 callback=self._callback
-        ):
-            recognizer = vosk.KaldiRecognizer(self.model, self.samplerate)
-            try:
-                while not self.enabled: pass
-                while self.enabled:
-                    data = self.audio_queue.get()
-
-                    if recognizer.AcceptWaveform(data):
-                        result = json.loads(recognizer.Result())
-                        text = result.get('text', '').strip()
-
-                        if text:
-                            print(f"🎤 You: {text}")
-                            return text
-                        else:
-                            return ""
-            except KeyboardInterrupt:
-                self.stop()
-                exit()
+            )
+        except Exception as e:  # sd.PortAudioError, or ValueError for an unsupported format
+            if str(e) != self._device_error:  # Report once per failure, not on every retry
+                print(f"Could not open the microphone: {e}")
+                self._device_error = str(e)
+            return False
+        self._device_error = None
+
+        with stream:  # Starts the stream; closes it on the way out
+            while self._enabled.is_set():
+                try:
+                    data = self.audio_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+
+                if self.vad.is_speech(data):
+                    silent_blocks = 0
+                    if not in_speech:
+                        in_speech = True
+                        for block in preroll:
+                            recognizer.AcceptWaveform(block)
+                        preroll.clear()
+                elif in_speech:
+                    silent_blocks += 1
+                else:
+                    preroll.append(data)
+                    continue
+
+                text = None
+                if recognizer.AcceptWaveform(data):
+                    text = json.loads(recognizer.Result()).get('text', '').strip()
+                    partial = ""
+                elif silent_blocks >= self.hangover_blocks:
+                    text = json.loads(recognizer.FinalResult()).get('text', '').strip()
+                    in_speech = False
+                    silent_blocks = 0
+                    partial = ""
+                elif self.on_partial or self.on_endpoint:
+                    hypothesis = json.loads(recognizer.PartialResult()).get('partial', '').strip()
+                    if hypothesis and hypothesis != partial:
+                        partial = hypothesis
+                        if self.on_partial:
+                            self.on_partial(partial)
+                    if silent_blocks == self.endpoint_blocks and partial and self.on_endpoint:
+                        self.on_endpoint(partial)
+
+                if text and handle_utterance(text) is False:
+                    return True
+        return True
+
+    def recognize(self):
+        """Block until the next utterance and return its text"""
+        if self._service is not None:
+            return self.utterances.get()
+
+        result = []
+        def _take(text):
+            result.append(text)
+            return False
+
+        try:
+            self._enabled.wait()
+            while self._capture(_take) is False:
+                time.sleep(self.DEVICE_RETRY_S)
+        except KeyboardInterrupt:
+            self.stop()
+            exit()
+        return result[0] if result else ""
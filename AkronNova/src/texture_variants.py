@@ -0,0 +1,216 @@
+"""
+Texture Variants for AkronNova
+Builds downscaled copies of Live2D model textures, cached on disk by source hash, and picks the
+smallest one that still looks sharp at the current window size
+"""
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# FileReferences entries that hold paths relative to the model3.json
+_PATH_KEYS = {"Moc", "Physics", "Pose", "DisplayInfo", "UserData", "File", "Sound"}
+
+
+def required_texture_size(width: int, height: int, device_pixel_ratio: float = 1.0,
+                          oversample: float = 2.0) -> int:
+    """
+    Texture edge length needed to draw a model in a width x height view.
+    The atlas packs the whole model into one square, so it needs some headroom over the view itself.
+    """
+    return int(max(width, height) * device_pixel_ratio * oversample)
+
+
+def _file_hash(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class TextureVariantCache:
+    """
+    For each model texture, a mip chain (every level half the previous one) is built down to the
+    smallest configured size and stored under <cache_dir>/<source sha256>/<size>.png. Each size also
+    gets a model3.json in cache_dir that points at the scaled textures and, through relative paths,
+    at the model's other files. Source hashes are remembered per (path, size, mtime) in a manifest
+    so unchanged textures are not re-read; only build() hashes, so lookups never read a texture.
+    """
+
+    def __init__(self, cache_dir: str, sizes: Sequence[int] = (1024, 2048)):
+        self.cache_dir = cache_dir
+        self.sizes = sorted(sizes)
+        self._manifest_path = os.path.join(cache_dir, "manifest.json")
+        self._manifest = self._load_manifest()
+        self._lock = threading.Lock()
+        self._building = set()
+        self._models: Dict[str, tuple] = {}  # model path -> (stat key, model3 sha, texture paths)
+
+    def _load_manifest(self) -> dict:
+        try:
+            with open(self._manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_manifest(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        _write_atomic(self._manifest_path, json.dumps(self._manifest, indent=1).encode("utf-8"))
+
+    def source_hash(self, path: str, compute: bool = True) -> Optional[str]:
+        """
+        SHA-256 of a source texture, from the manifest while its size and mtime are unchanged.
+        With compute=False a texture not in the manifest gives None instead of being hashed.
+        """
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self._manifest.get(key)
+        if entry and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            return entry["sha256"]
+        if not compute:
+            return None
+        sha = _file_hash(path)
+        self._manifest[key] = {"size": stat.st_size, "mtime": stat.st_mtime, "sha256": sha}
+        return sha
+
+    def _texture_path(self, sha: str, size: int) -> str:
+        return os.path.join(self.cache_dir, sha, f"{size}.png")
+
+    def _model(self, model_path: str) -> tuple:
+        """(model3 sha prefix, texture paths), re-read only when the model3.json changes"""
+        stat = os.stat(model_path)
+        key = (stat.st_size, stat.st_mtime_ns)
+        cached = self._models.get(model_path)
+        if cached is not None and cached[0] == key:
+            return cached[1:]
+        with open(model_path, "rb") as f:
+            data = f.read()
+        model = json.loads(data.decode("utf-8"))
+        model_dir = os.path.dirname(model_path)
+        textures = [os.path.join(model_dir, t) for t in model["FileReferences"].get("Textures", [])]
+        cached = (key, hashlib.sha256(data).hexdigest()[:16], textures)
+        self._models[model_path] = cached
+        return cached[1:]
+
+    def _variant_path(self, model_path: str, size: int) -> str:
+        model_sha = self._model(model_path)[0]
+        name = os.path.basename(model_path).replace(".model3.json", "")
+        return os.path.join(self.cache_dir, f"{name}.{model_sha}.{size}.model3.json")
+
+    def _textures(self, model_path: str) -> List[str]:
+        return self._model(model_path)[1]
+
+    def available(self, model_path: str) -> Dict[int, str]:
+        """
+        Sizes whose variant model3.json and textures are all on disk. Only the manifest is consulted:
+        a texture without a current hash there has no variants yet (build() will hash it).
+        """
+        result = {}
+        with self._lock:
+            hashes = [self.source_hash(t, compute=False) for t in self._textures(model_path)]
+        if None in hashes:
+            return result
+        for size in self.sizes:
+            variant = self._variant_path(model_path, size)
+            if os.path.exists(variant) and all(os.path.exists(self._texture_path(sha, size)) for sha in hashes):
+                result[size] = variant
+        return result
+
+    def select(self, model_path: str, required_px: int, build: bool = True) -> str:
+        """
+        Return the model3.json to load: the smallest cached variant of at least required_px, or the
+        original model. Missing variants are built in the background for the next load.
+        """
+        available = self.available(model_path)
+        if build and len(available) < len(self.sizes):
+            self.build_async(model_path)
+        for size in sorted(available):
+            if size >= required_px:
+                logger.info(f"Using {size}px textures for {os.path.basename(model_path)} (need {required_px}px)")
+                return available[size]
+        return model_path
+
+    def build_async(self, model_path: str):
+        with self._lock:
+            if model_path in self._building:
+                return
+            self._building.add(model_path)
+
+        def _worker():
+            try:
+                self.build(model_path)
+            except Exception as e:
+                logger.error(f"Failed to build texture variants for {model_path}: {e}")
+            finally:
+                with self._lock:
+                    self._building.discard(model_path)
+
+        threading.Thread(target=_worker, name="texture-variants", daemon=True).start()
+
+    def build(self, model_path: str) -> Dict[int, str]:
+        """Generate every missing texture level and variant model3.json; returns {size: model3 path}"""
+        from PIL import Image
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        textures = self._textures(model_path)
+        with self._lock:
+            hashes = [self.source_hash(t) for t in textures]
+            self._save_manifest()
+
+        for texture, sha in zip(textures, hashes):
+            if all(os.path.exists(self._texture_path(sha, size)) for size in self.sizes):
+                continue
+            os.makedirs(os.path.join(self.cache_dir, sha), exist_ok=True)
+            with Image.open(texture) as image:
+                level = image.convert("RGBA")
+            smallest = self.sizes[0]
+            # Halve step by step: each level is filtered from the one above, like a mip chain
+            while max(level.size) // 2 >= smallest:
+                level = level.resize((level.width // 2, level.height // 2), Image.Resampling.LANCZOS)
+                size = max(level.size)
+                if size in self.sizes and not os.path.exists(self._texture_path(sha, size)):
+                    buffer = io.BytesIO()
+                    level.save(buffer, format="PNG")
+                    _write_atomic(self._texture_path(sha, size), buffer.getvalue())
+            logger.info(f"Built texture variants for {os.path.basename(texture)}")
+
+        return {size: self._write_variant(model_path, hashes, size) for size in self.sizes
+                if all(os.path.exists(self._texture_path(sha, size)) for sha in hashes)}
+
+    def _write_variant(self, model_path: str, hashes: List[str], size: int) -> str:
+        with open(model_path, "r", encoding="utf-8") as f:
+            model = json.load(f)
+        variant_path = self._variant_path(model_path, size)
+        model_dir = os.path.dirname(os.path.abspath(model_path))
+        cache_dir = os.path.abspath(self.cache_dir)
+
+        def _relocate(value, key=None):
+            if isinstance(value, dict):
+                return {k: _relocate(v, k) for k, v in value.items()}
+            if isinstance(value, list):
+                return [_relocate(v, key) for v in value]
+            if isinstance(value, str) and key in _PATH_KEYS:
+                return os.path.relpath(os.path.join(model_dir, value), cache_dir).replace(os.sep, "/")
+            return value
+
+        references = _relocate(model["FileReferences"])
+        references["Textures"] = [
+            os.path.relpath(self._texture_path(sha, size), cache_dir).replace(os.sep, "/") for sha in hashes
+        ]
+        model["FileReferences"] = references
+        _write_atomic(variant_path, json.dumps(model, ensure_ascii=False, indent=1).encode("utf-8"))
+        return variant_path
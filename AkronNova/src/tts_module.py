@@ -1,14 +1,29 @@
+import numpy as np
 from stts.silero_tts import SileroTTS
 
 class TTSModule(SileroTTS):
+    MODEL_ID = "v3_en"
+    SPEAKER = "en_5"
+    SAMPLE_RATE = 48000
+
     def __init__(self):
         super().__init__(
-        model_id="v3_en",
+        model_id=self.MODEL_ID,
         language="en",
-        speaker="en_5",
-        sample_rate=48000,
+        speaker=self.SPEAKER,
+        sample_rate=self.SAMPLE_RATE,
         device="cpu",
         )
 
-    def synth(self, text):
-        self.tts(text, "temp.wav")
+    def synth(self, text) -> np.ndarray:
+        """Synthesize text to mono float32 PCM at self.sample_rate, without touching the disk"""
+        audio = self.model.apply_tts(text=text, speaker=self.speaker, sample_rate=self.sample_rate)
+        return audio.detach().cpu().numpy().astype(np.float32, copy=False)
+
+    def warm_up(self):
+        """Run one short inference so the first real utterance doesn't pay for lazy initialization"""
+        self.synth("Hi.")
+
+    def synth_to_file(self, text, output_file):
+        self.tts(text, output_file)
+        return output_file
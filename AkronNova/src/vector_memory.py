@@ -0,0 +1,243 @@
+"""
+Vector Memory for AkronNova
+Embeds past turns and retrieves the most relevant ones for the prompt
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from conversation_store import WORD_PATTERN
+
+logger = logging.getLogger(__name__)
+
+
+class HashingEmbedder:
+    """
+    Dependency-free embedder: word unigrams and character trigrams are hashed into a fixed number of
+    signed buckets and the result is L2-normalized.
+    """
+
+    def __init__(self, dim: int = 128):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        features = []
+        for word in WORD_PATTERN.findall(text.lower()):
+            features.append(word)
+            padded = f"#{word}#"
+            features.extend(padded[i:i + 3] for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        features = self._features(text)
+        if not features:
+            return vector
+        hashes = np.fromiter((zlib.crc32(f.encode("utf-8")) for f in features), dtype=np.uint32, count=len(features))
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dim, signs)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SentenceTransformerEmbedder:
+    """Local CPU sentence embedding model; requires the optional sentence-transformers package"""
+
+    def __init__(self, model_name: str):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.name = model_name
+        self.dim = self.model.get_sentence_embedding_dimension()
+
+    def embed(self, text: str) -> np.ndarray:
+        return self.model.encode(text, normalize_embeddings=True).astype(np.float32)
+
+
+def create_embedder(model_name: Optional[str] = None, dim: int = 128):
+    """Use the named local model when it can be loaded, the hashing embedder otherwise"""
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception as e:
+            logger.warning(f"Could not load embedding model {model_name} ({e}); using hashed n-grams")
+    return HashingEmbedder(dim)
+
+
+def _write_atomic(path: str, directory: str, write):
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class VectorMemory:
+    """
+    Flat in-memory index of unit vectors held in one contiguous float32 matrix.
+    A search is a single matrix-vector product plus a partial sort, which stays in the low
+    milliseconds at 100k memories. With a path, new memories are appended to disk after save_every
+    of them or save_interval seconds with unsaved ones, whichever comes first, so a crash loses little.
+    On disk, {path}.f32 holds the raw vector rows and {path}.jsonl a header line followed by one
+    line of text and metadata per row; both only grow, and are rewritten only by compact().
+    """
+
+    def __init__(self, embedder, path: Optional[str] = None, initial_capacity: int = 1024,
+                 save_every: int = 20, save_interval: float = 60.0):
+        self.embedder = embedder
+        self.path = path
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._unsaved = 0
+        self._saved = 0  # Rows already on disk
+        self._needs_compaction = False  # The files on disk don't match the index
+        self._last_save = time.monotonic()
+        self._vectors = np.zeros((initial_capacity, embedder.dim), dtype=np.float32)
+        self._texts: List[str] = []
+        self._meta: List[Dict] = []
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # Keeps concurrent saves from appending the same rows
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, text: str, meta: Optional[Dict] = None):
+        vector = self.embedder.embed(text)
+        with self._lock:
+            count = len(self._texts)
+            if count == len(self._vectors):
+                grown = np.zeros((max(1, count) * 2, self._vectors.shape[1]), dtype=np.float32)
+                grown[:count] = self._vectors
+                self._vectors = grown
+            self._vectors[count] = vector
+            self._texts.append(text)
+            self._meta.append(meta or {})
+            self._unsaved += 1
+            due = self.path and (self._unsaved >= self.save_every or
+                                 time.monotonic() - self._last_save >= self.save_interval)
+        if due:
+            self.save()
+
+    def search(self, query: str, k: int = 5, min_score: float = 0.0) -> List[Tuple[float, str, Dict]]:
+        """Return up to k (score, text, meta) tuples by cosine similarity, best first"""
+        query_vector = self.embedder.embed(query)
+        with self._lock:
+            count = len(self._texts)
+            if count == 0 or k <= 0:
+                return []
+            scores = self._vectors[:count] @ query_vector
+            k = min(k, count)
+            top = np.argpartition(scores, count - k)[count - k:]
+            top = top[np.argsort(scores[top])[::-1]]
+            return [
+                (float(scores[i]), self._texts[i], self._meta[i])
+                for i in top if scores[i] >= min_score
+            ]
+
+    def _header(self) -> bytes:
+        return self._line({"embedder": self.embedder.name, "dim": self.embedder.dim})
+
+    @staticmethod
+    def _line(entry: Dict) -> bytes:
+        return (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def save(self):
+        """Append the memories added since the last save; the cost is proportional to those alone"""
+        if not self.path:
+            return
+        if self._needs_compaction:
+            self.compact()
+            return
+        with self._save_lock:
+            with self._lock:
+                start, count = self._saved, len(self._texts)
+                vectors = self._vectors[start:count].copy()
+                entries = [{"text": text, "meta": meta}
+                           for text, meta in zip(self._texts[start:count], self._meta[start:count])]
+                self._unsaved = 0
+                self._last_save = time.monotonic()
+            if not entries:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            # Vectors first: on load, rows without a metadata line are dropped
+            with open(f"{self.path}.f32", "ab") as f:
+                f.write(vectors.tobytes())
+            with open(f"{self.path}.jsonl", "ab") as f:
+                if f.tell() == 0:
+                    f.write(self._header())
+                f.write(b"".join(self._line(entry) for entry in entries))
+            self._saved = count
+
+    def compact(self):
+        """Rewrite both files from the index, replacing each atomically"""
+        if not self.path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with self._save_lock:
+            with self._lock:
+                count = len(self._texts)
+                vectors = self._vectors[:count].copy()
+                lines = [self._header()] + [self._line({"text": text, "meta": meta})
+                                            for text, meta in zip(self._texts, self._meta)]
+                self._unsaved = 0
+                self._last_save = time.monotonic()
+            _write_atomic(f"{self.path}.f32", directory, lambda f: f.write(vectors.tobytes()))
+            _write_atomic(f"{self.path}.jsonl", directory, lambda f: f.write(b"".join(lines)))
+            self._saved = count
+            self._needs_compaction = False
+
+    def load(self):
+        if not os.path.exists(f"{self.path}.jsonl"):
+            return
+        texts, meta = [], []
+        try:
+            with open(f"{self.path}.jsonl", "r", encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # A line cut short by a crash; it and anything after it are dropped
+                    texts.append(entry["text"])
+                    meta.append(entry["meta"])
+            vectors = np.zeros(0, dtype=np.float32)
+            if os.path.exists(f"{self.path}.f32"):
+                vectors = np.fromfile(f"{self.path}.f32", dtype=np.float32)
+        except (OSError, ValueError, KeyError) as e:
+            logger.error(f"Failed to load vector memory from {self.path}: {e}")
+            self._needs_compaction = True
+            return
+        dim = self.embedder.dim
+        if header.get("embedder") != self.embedder.name or header.get("dim") != dim:
+            logger.warning(f"Vector memory at {self.path} does not match the current embedder; starting empty")
+            self._needs_compaction = True
+            return
+
+        rows = len(vectors) // dim
+        count = min(rows, len(texts))
+        # A crash between the two appends leaves one file longer than the other
+        self._needs_compaction = rows * dim != len(vectors) or rows != len(texts)
+        vectors = vectors[:count * dim].reshape(count, dim)
+        with self._lock:
+            capacity = max(len(self._vectors), count * 2)
+            self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+            self._vectors[:count] = vectors
+            self._texts = texts[:count]
+            self._meta = meta[:count]
+            self._saved = count
@@ -0,0 +1,45 @@
+"""
+Web Profile for AkronNova
+A named, on-disk QWebEngineProfile for the avatar page, so its storage survives restarts instead of
+starting empty in the default profile every launch. The HTTP cache only covers http(s) content:
+Chromium does not cache responses from custom scheme handlers, so akronnova:// assets bypass it.
+"""
+import logging
+import os
+
+from PyQt6.QtWebEngineCore import QWebEngineProfile
+
+logger = logging.getLogger(__name__)
+
+STORAGE_NAME = "akronnova"
+
+
+def create_profile(storage_path: str, http_cache_mb: int = 64, parent=None) -> QWebEngineProfile:
+    """Create the persistent profile under storage_path (profile data) and storage_path/cache"""
+    storage_path = os.path.abspath(storage_path)
+    cache_path = os.path.join(storage_path, "cache")
+    os.makedirs(cache_path, exist_ok=True)
+    cache_bytes = int(http_cache_mb * 1024 * 1024)
+
+    try:
+        # Qt 6.9+: paths have to be fixed before the profile is created
+        from PyQt6.QtWebEngineCore import QWebEngineProfileBuilder
+    except ImportError:
+        QWebEngineProfileBuilder = None
+
+    if QWebEngineProfileBuilder is not None:
+        profile = (QWebEngineProfileBuilder()
+                   .setPersistentStoragePath(storage_path)
+                   .setCachePath(cache_path)
+                   .setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+                   .setHttpCacheMaximumSize(cache_bytes)
+                   .createProfile(STORAGE_NAME, parent))
+    else:
+        profile = QWebEngineProfile(STORAGE_NAME, parent)
+        profile.setPersistentStoragePath(storage_path)
+        profile.setCachePath(cache_path)
+        profile.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        profile.setHttpCacheMaximumSize(cache_bytes)
+
+    logger.info(f"Web profile '{STORAGE_NAME}' at {storage_path} ({http_cache_mb} MB HTTP cache)")
+    return profile
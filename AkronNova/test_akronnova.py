@@ -9,15 +9,17 @@ import os
 # Add the src directory to the path so we can import modules
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from main import AkronNovaDesktopCharacter
-from PyQt5.QtWidgets import QApplication
+from main import AkronNovaDesktopCharacter, EventLoopBridge, install_bridge, prepare_qt
+from PyQt6.QtWidgets import QApplication
 
 def test_akronnova():
     """Test basic AkronNova functionality"""
     print("Testing AkronNova Desktop AI Companion...")
     
-    # Initialize Qt application
+    # Initialize Qt application (QtWebEngine and the asset scheme have to be set up first)
+    prepare_qt()
     app = QApplication(sys.argv)
+    install_bridge(EventLoopBridge.for_qt(app))
     
     # Create AkronNova instance
     akronnova = AkronNovaDesktopCharacter()
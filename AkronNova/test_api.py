@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming LLM replies
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+try:
+    from api_handler import SSE_DONE, iter_sse_deltas, parse_sse_line
+except OSError:  # sounddevice raises OSError when the PortAudio library is missing
+    pytest.skip("PortAudio is not available", allow_module_level=True)
+
+
+def sse(content):
+    return "data: " + json.dumps({"choices": [{"delta": {"content": content}}]})
+
+
+class FakeResponse:
+    def __init__(self, lines=(), content_type="text/event-stream", body=None):
+        self.headers = {"Content-Type": content_type}
+        self.lines = list(lines)
+        self.body = body
+        self.encoding = None
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+    def json(self):
+        return self.body
+
+
+def test_parse_sse_line_returns_content_delta():
+    assert parse_sse_line(sse("Hel")) == "Hel"
+    assert parse_sse_line('data:{"choices":[{"delta":{"content":"lo"}}]}') == "lo"
+
+
+def test_parse_sse_line_skips_lines_without_content():
+    assert parse_sse_line("") is None
+    assert parse_sse_line(": keep-alive") is None
+    assert parse_sse_line("event: ping") is None
+    assert parse_sse_line('data: {"choices": []}') is None
+    assert parse_sse_line('data: {"choices": [{"delta": {"role": "assistant"}}]}') is None
+
+
+def test_parse_sse_line_done():
+    assert parse_sse_line("data: [DONE]") is SSE_DONE
+
+
+def test_iter_sse_deltas_stops_at_done():
+    response = FakeResponse(["", sse("Hi"), ": ping", sse(" there"), "data: [DONE]", sse("late")])
+    assert list(iter_sse_deltas(response)) == ["Hi", " there"]
+    assert response.encoding == "utf-8"
+
+
+def test_iter_sse_deltas_falls_back_to_plain_json():
+    body = {"choices": [{"message": {"content": "Whole reply"}}]}
+    response = FakeResponse(content_type="application/json; charset=utf-8", body=body)
+    assert list(iter_sse_deltas(response)) == ["Whole reply"]
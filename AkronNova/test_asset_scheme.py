@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the akronnova:// asset scheme
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+pytest.importorskip("PyQt6.QtWebEngineCore", exc_type=ImportError)
+from PyQt6.QtCore import QUrl
+from asset_scheme import AssetSchemeHandler, asset_url, mime_type
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+@pytest.fixture
+def handler():
+    return AssetSchemeHandler(ROOT_DIR)
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("/web/index.html", "web/index.html"),
+    ("/assets/model/a.model3.json", "assets/model/a.model3.json"),
+    ("/assets/model/../../web/index.html", "web/index.html"),
+])
+def test_resolve_allows_served_directories(handler, path, expected):
+    assert handler._resolve(QUrl(f"akronnova://app{path}")) == expected
+
+
+@pytest.mark.parametrize("path", [
+    "/config/settings.json",
+    "/web/../config/settings.json",
+    "/web/%2e%2e/config/settings.json",
+    "/web/..%2fconfig/settings.json",
+    "/../../etc/passwd",
+    "/webx/index.html",
+    "/web",
+])
+def test_resolve_rejects_paths_outside(handler, path):
+    assert handler._resolve(QUrl(f"akronnova://app{path}")) is None
+
+
+def test_asset_url_round_trip():
+    url = asset_url(ROOT_DIR, os.path.join(ROOT_DIR, "web", "index.html"))
+    assert url == "akronnova://app/web/index.html"
+    assert asset_url(ROOT_DIR, os.path.dirname(ROOT_DIR)) is None
+
+
+def test_mime_type():
+    assert mime_type("web/live2d-core.js") == "text/javascript"
+    assert mime_type("assets/m/m.moc3") == "application/octet-stream"
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the cached config loader and its schema
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+import config_loader
+from config_loader import ConfigLoader, get_config, register_schema, validate
+
+
+@pytest.fixture(autouse=True)
+def isolated_schema(monkeypatch):
+    """Keep schemas and shared loaders registered by a test out of the others"""
+    monkeypatch.setattr(config_loader, "SCHEMA", dict(config_loader.SCHEMA))
+    monkeypatch.setattr(config_loader, "_configs", {})
+
+
+def write_config(tmp_path, config):
+    path = tmp_path / "settings.json"
+    path.write_text(json.dumps(config), encoding="utf-8")
+    return str(path)
+
+
+def test_validate_reports_wrong_types():
+    schema = {"a.count": int, "a.rate": (int, float), "a.name": str}
+    config = {"a": {"count": True, "rate": 1.5, "name": 3}}
+    errors = validate(config, schema)
+    assert errors == ["a.count should be int, got True", "a.name should be str, got 3"]
+    assert validate({}, schema) == []
+
+
+def test_get_ignores_values_of_the_wrong_type(tmp_path, capsys):
+    register_schema({"voice.block_ms": int})
+    loader = ConfigLoader(write_config(tmp_path, {"voice": {"block_ms": "100"}}))
+    assert loader.get("voice.block_ms", 50) == 50
+    assert loader.get("voice.block_ms", 50) == 50
+    assert capsys.readouterr().out.count("Ignoring voice.block_ms") == 1
+
+
+def test_register_schema_applies_to_loaded_files(tmp_path, capsys):
+    loader = get_config(write_config(tmp_path, {"speech": {"max_chars": "long"}}))
+    assert loader.get("speech.max_chars", 200) == "long"
+
+    register_schema({"speech.max_chars": int})
+    assert "speech.max_chars should be int" in capsys.readouterr().out
+    assert loader.get("speech.max_chars", 200) == 200
+
+
+def test_get_config_shares_one_loader_per_file(tmp_path):
+    path = write_config(tmp_path, {"app_name": "AkronNova"})
+    assert get_config(path) is get_config(path)
+    assert get_config(path).get("app_name") == "AkronNova"
+
+
+def test_reload_reports_changed_keys(tmp_path):
+    path = write_config(tmp_path, {"a": {"b": 1, "c": 2}})
+    loader = ConfigLoader(path)
+    seen = []
+    loader.subscribe(seen.append, "a")
+    write_config(tmp_path, {"a": {"b": 1, "c": 3}, "d": 4})
+    assert loader.reload() == {"a.c", "d"}
+    assert loader.get("a.c") == 3
+    assert seen == [{"a.c"}]  # Only the keys under the subscribed prefix
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for the context window, response cache, conversation store and vector memory
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from context_window import ConversationContext, message_tokens
+from conversation_store import ConversationStore
+from response_cache import DiskLRUCache
+from vector_memory import HashingEmbedder, VectorMemory
+
+
+def filled_context(turns, **kwargs):
+    context = ConversationContext(**kwargs)
+    for i in range(turns):
+        context.append("user" if i % 2 == 0 else "assistant", f"message number {i} " + "x" * 36)
+    return context
+
+
+def test_context_evicts_oldest_turns_to_fit():
+    context = filled_context(10, max_prompt_tokens=60, min_recent_messages=2)
+    messages = context.build_messages()
+    assert sum(message_tokens(m) for m in messages) <= 60
+    assert messages[-1]["content"].startswith("message number 9 ")
+    assert len(context.turns) == len(messages) < 10
+    assert context.last_metrics["evicted_messages"] == 10 - len(messages)
+
+
+def test_context_keeps_min_recent_messages_over_budget():
+    context = filled_context(6, max_prompt_tokens=1, min_recent_messages=3)
+    assert len(context.build_messages()) == 3
+
+
+def test_context_hands_evicted_turns_to_summarizer():
+    seen = []
+
+    def summarize(summary, turns):
+        seen.extend(turns)
+        return "they talked"
+
+    context = filled_context(10, max_prompt_tokens=60, summarizer=summarize)
+    context.build_messages()
+    deadline = time.monotonic() + 5
+    while context.summary != "they talked" and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert context.summary == "they talked"
+    assert seen[0]["content"].startswith("message number 0 ")
+
+
+def test_context_recalled_goes_before_latest_user_turn():
+    context = filled_context(3, max_prompt_tokens=1000)
+    recalled = [{"role": "system", "content": "remembered"}]
+    messages = context.build_messages([{"role": "system", "content": "persona"}], recalled=recalled)
+    assert [m["content"] for m in messages[:3]][0] == "persona"
+    assert messages[-2] == recalled[0]
+    assert messages[-1]["role"] == "user"
+
+
+def test_context_preview_has_no_side_effects():
+    context = filled_context(9, max_prompt_tokens=60)
+    turns = list(context.turns)
+    preview = context.preview_messages("next question")
+    assert context.turns == turns
+    assert not context.metrics
+
+    context.append("user", "next question")
+    assert context.build_messages() == preview
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert "b" not in cache
+    assert not (tmp_path / "b").exists()
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.total_bytes == 8
+
+
+def test_cache_rejects_entries_larger_than_the_cache(tmp_path):
+    cache = DiskLRUCache(str(tmp_path), max_bytes=4)
+    cache.put("big", b"12345")
+    assert cache.get("big") is None
+    assert cache.total_bytes == 0
+
+
+def test_cache_reloads_entries_from_disk(tmp_path):
+    DiskLRUCache(str(tmp_path)).put("key", b"value")
+    assert DiskLRUCache(str(tmp_path)).get("key") == b"value"
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ConversationStore(str(tmp_path / "conversations.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_store_search_finds_relevant_turns(store):
+    store.append("user", "What is the weather like in Paris?")
+    store.append("assistant", "I like cats.")
+    store.append("user", "Is it raining in Paris today, what weather?")
+    store.flush()
+    results = store.search("paris weather")
+    assert {row["content"] for row in results} == {
+        "What is the weather like in Paris?", "Is it raining in Paris today, what weather?"
+    }
+    assert store.search("cats", limit=1)[0]["role"] == "assistant"
+
+
+def test_store_search_ignores_query_syntax(store):
+    store.append("user", "don't forget the milk")
+    store.flush()
+    assert store.search('"milk" OR NEAR( -forget*') != []
+    assert store.search("?!") == []
+
+
+def test_store_search_excludes_session(store):
+    store.append("user", "the secret word is banana")
+    store.flush()
+    assert store.search("banana", exclude_session=store.session) == []
+    assert store.count() == 1
+
+
+def test_vector_memory_finds_closest_text():
+    memory = VectorMemory(HashingEmbedder(), initial_capacity=1)
+    for text in ["I love ice cream", "The train leaves at noon", "My cat is called Mochi"]:
+        memory.add(text)
+    results = memory.search("what is the name of your cat", k=2)
+    assert len(results) == 2
+    assert results[0][1] == "My cat is called Mochi"
+    assert results[0][0] >= results[1][0]
+    assert memory.search("cat", k=0) == []
+
+
+def test_vector_memory_appends_on_save(tmp_path):
+    path = str(tmp_path / "memory")
+    memory = VectorMemory(HashingEmbedder(), path, save_every=2)
+    memory.add("first memory", {"role": "user"})
+    assert not os.path.exists(path + ".jsonl")
+    memory.add("second memory")
+    size = os.path.getsize(path + ".f32")
+    memory.add("third memory")
+    memory.save()
+    assert os.path.getsize(path + ".f32") == size * 3 // 2
+    with open(path + ".jsonl", encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+    reloaded = VectorMemory(HashingEmbedder(), path)
+    assert len(reloaded) == 3
+    assert reloaded.search("first memory", k=1)[0][1:] == ("first memory", {"role": "user"})
+
+
+def test_vector_memory_drops_torn_rows_and_compacts(tmp_path):
+    path = str(tmp_path / "memory")
+    memory = VectorMemory(HashingEmbedder(), path)
+    memory.add("kept memory")
+    memory.add("torn memory")
+    memory.save()
+    with open(path + ".jsonl", "rb+") as f:
+        f.truncate(os.path.getsize(path + ".jsonl") - 5)
+
+    reloaded = VectorMemory(HashingEmbedder(), path)
+    assert len(reloaded) == 1
+    reloaded.add("new memory")
+    reloaded.save()
+    results = VectorMemory(HashingEmbedder(), path).search("memory", k=5)
+    assert {text for _, text, _ in results} == {"kept memory", "new memory"}
+
+
+def test_vector_memory_ignores_other_embedder(tmp_path):
+    path = str(tmp_path / "memory")
+    memory = VectorMemory(HashingEmbedder(64), path)
+    memory.add("hello")
+    memory.save()
+    assert len(VectorMemory(HashingEmbedder(128), path)) == 0
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming emotion tags and speech segmentation
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+pytest.importorskip("PyQt6.QtWebEngineWidgets", exc_type=ImportError)
+try:
+    from speech_pipeline import SpeechRouter, split_sentences
+except OSError:  # sounddevice raises OSError when the PortAudio library is missing
+    pytest.skip("PortAudio is not available", allow_module_level=True)
+from live2d_handler import EmotionTagParser
+
+EMO_MAP = {"joy": 3, "sad": 1, "angry": 2}
+
+
+def feed_all(parser, text, step):
+    tags, clean = [], ""
+    for i in range(0, len(text), step):
+        chunk_tags, chunk_clean = parser.feed(text[i:i + step])
+        tags += chunk_tags
+        clean += chunk_clean
+    flush_tags, flush_clean = parser.flush()
+    return tags + flush_tags, clean + flush_clean
+
+
+def route(text, step=3, max_chars=200):
+    segments = []
+    router = SpeechRouter(EmotionTagParser(EMO_MAP), lambda t, cues: segments.append((t, cues)), max_chars)
+    for i in range(0, len(text), step):
+        router.feed(text[i:i + step])
+    router.finish()
+    return [(t, [(round(fraction, 2), index) for fraction, index in cues]) for t, cues in segments]
+
+
+@pytest.mark.parametrize("step", [1, 2, 3, 5, 100])
+def test_parser_feed_matches_parse(step):
+    text = "[joy] Hello there! [SAD]I miss you [angry] a lot."
+    parser = EmotionTagParser(EMO_MAP)
+    assert feed_all(parser, text, step) == parser.parse(text)
+
+
+def test_parser_holds_back_partial_tag():
+    parser = EmotionTagParser(EMO_MAP)
+    assert parser.feed("Hi [jo") == ([], "Hi ")
+    assert parser.feed("y] there") == ([(3, 3)], " there")
+
+
+def test_parser_flush_releases_unfinished_tag_as_text():
+    parser = EmotionTagParser(EMO_MAP)
+    assert parser.feed("Hi [sa") == ([], "Hi ")
+    assert parser.flush() == ([], "[sa")
+
+
+def test_parser_leaves_unknown_tags():
+    parser = EmotionTagParser(EMO_MAP)
+    assert parser.parse("[wink] hi") == ([], "[wink] hi")
+
+
+def test_split_sentences():
+    assert split_sentences("Hello there. How are you? Fine!") == ["Hello there.", "How are you?", "Fine!"]
+    assert split_sentences("  ") == []
+
+
+def test_split_sentences_long_sentence_at_clauses():
+    text = "one two three, four five six, seven eight nine."
+    chunks = split_sentences(text, max_chars=20)
+    assert chunks == ["one two three,", "four five six,", "seven eight nine."]
+
+
+def test_split_sentences_skips_abbreviations():
+    assert split_sentences("Mr. Smith went home. Dr. Who is here.") == ["Mr. Smith went home.", "Dr. Who is here."]
+
+
+def test_router_tags_time_the_expression_within_the_sentence():
+    assert route("[joy] hi [sad] there [angry] friend.") == [("hi there friend.", [(0.0, 3), (0.12, 1), (0.5, 2)])]
+    assert route("Hello [joy] world.") == [("Hello world.", [(0.42, 3)])]
+
+
+def test_router_sentences_keep_their_tag():
+    assert route("[joy] Hello there. [sad] Bye for now. More text") == [
+        ("Hello there.", [(0.0, 3)]), ("Bye for now.", [(0.0, 1)]), ("More text", [])
+    ]
+
+
+def test_router_merges_punctuation_and_short_sentences():
+    assert route("I love it [joy]!") == [("I love it!", [(0.9, 3)])]
+    assert route("Hi[joy]. Next one is long.") == [("Hi. Next one is long.", [(0.1, 3)])]
+    assert route("Okay! I see what you mean now.") == [("Okay! I see what you mean now.", [])]
+
+
+def test_router_trailing_tag_is_emitted_last():
+    assert route("Oh no, really! [sad]") == [("Oh no, really!", []), ("", [(1.0, 1)])]
+
+
+def test_router_adjacent_tags_keep_their_order():
+    assert route("Hello there friend. [sad][angry] Bye for now.") == [
+        ("Hello there friend.", []), ("Bye for now.", [(0.0, 1), (0.0, 2)])
+    ]
+
+
+def test_router_splits_long_text_at_clauses():
+    segments = route("[joy] alpha beta gamma, delta epsilon zeta, eta theta", max_chars=25)
+    assert segments[0] == ("alpha beta gamma,", [(0.0, 3)])
+    assert "".join(text for text, _ in segments).replace(" ", "") == "alphabetagamma,deltaepsilonzeta,etatheta"
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for voice activity detection and the STT service
+"""
+
+import os
+import queue
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+pytest.importorskip("vosk")
+try:
+    from stt_module import EnergyVAD, STTModule, create_vad
+except OSError:  # sounddevice raises OSError when the PortAudio library is missing
+    pytest.skip("PortAudio is not available", allow_module_level=True)
+
+
+def block(amplitude, samples=1600):
+    return (np.ones(samples) * amplitude).astype(np.int16).tobytes()
+
+
+def test_energy_vad_separates_speech_from_silence():
+    vad = EnergyVAD(min_rms=300.0)
+    assert not vad.is_speech(block(0))
+    assert not vad.is_speech(block(100))
+    assert vad.is_speech(block(5000))
+    assert not vad.is_speech(b"")
+
+
+def test_energy_vad_adapts_to_background_noise():
+    vad = EnergyVAD(min_rms=300.0, margin=3.0, adapt_rate=0.5)
+    assert vad.is_speech(block(700))
+    for _ in range(20):
+        vad.is_speech(block(290))
+    # 700 is now within margin of the noise floor, so no longer counts as speech
+    assert not vad.is_speech(block(700))
+    assert vad.is_speech(block(5000))
+
+
+def test_create_vad_falls_back_to_energy(monkeypatch):
+    import stt_module
+    monkeypatch.setattr(stt_module, "webrtcvad", None)
+    assert isinstance(create_vad("webrtc", 16000), EnergyVAD)
+    assert isinstance(create_vad("energy", 16000), EnergyVAD)
+
+
+def test_utterances_queue_only_without_callback():
+    stt = STTModule.__new__(STTModule)  # Skips loading the Vosk model
+    stt.utterances = queue.Queue()
+    stt.on_utterance = None
+    stt._emit("hello")
+    assert stt.utterances.get_nowait() == "hello"
+
+    heard = []
+    stt.on_utterance = heard.append
+    stt._emit("again")
+    assert heard == ["again"]
+    assert stt.utterances.empty()
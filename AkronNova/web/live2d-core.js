@@ -47,11 +47,21 @@ export async function loadModel(modelPath) {
     }
 }
 
-// Update model parameters
-export function updateModel(model, deltaTime) {
-    // In a real implementation, this would update the model's animation state
-    // based on elapsed time and current parameters
-    console.log('Updating model animation...');
+// Update model parameters: write the composed values into the Cubism core model, if one was loaded
+export function updateModel(model, parameters) {
+    const core = model && model.core;
+    if (!core) {
+        return;
+    }
+    const values = core.parameters.values;
+    for (const id in parameters) {
+        const index = model.parameterIndex.get(id);
+        if (index !== undefined) {
+            values[index] = Math.min(core.parameters.maximumValues[index],
+                Math.max(core.parameters.minimumValues[index], parameters[id]));
+        }
+    }
+    core.update();
 }
 
 // Set expression on the model
@@ -79,10 +89,72 @@ export async function loadTexture(texturePath) {
     });
 }
 
+// Create the Cubism core model from the model's .moc3, so parameter values are applied for real.
+// Returns null when the moc is missing or unreadable; parameters are then only tracked in JavaScript.
+export async function loadCoreModel(mocUrl) {
+    if (typeof Live2DCubismCore === 'undefined') {
+        return null;
+    }
+    try {
+        const response = await fetch(mocUrl);
+        if (!response.ok) {
+            throw new Error(response.statusText);
+        }
+        const moc = Live2DCubismCore.Moc.fromArrayBuffer(await response.arrayBuffer());
+        return moc ? Live2DCubismCore.Model.fromMoc(moc) : null;
+    } catch (error) {
+        console.warn(`Could not load ${mocUrl}; parameters will not reach the Cubism core:`, error);
+        return null;
+    }
+}
+
 // Helper function to handle model parameters
 export function setModelParameter(model, parameterId, value) {
-    console.log(`Setting parameter ${parameterId} to ${value}`);
-    // In a real implementation, this would update the model's internal parameters
+    model.overrides[parameterId] = value;
+}
+
+// Value of a motion3.json curve at time t. Segments are [t0, v0, (type, points...)*] with
+// type 0 linear (1 point), 1 bezier (3 points), 2 stepped (1 point), 3 inverse stepped (1 point).
+export function evaluateCurve(segments, t) {
+    let time = segments[0];
+    let value = segments[1];
+    if (t <= time) {
+        return value;
+    }
+    let i = 2;
+    while (i < segments.length) {
+        const type = segments[i];
+        const points = type === 1 ? 3 : 1;
+        const endTime = segments[i + 1 + (points - 1) * 2];
+        const endValue = segments[i + 2 + (points - 1) * 2];
+        if (t < endTime) {
+            const ratio = (t - time) / (endTime - time);
+            switch (type) {
+                case 0:
+                    return value + (endValue - value) * ratio;
+                case 1: {
+                    // De Casteljau on the values, parameterised by the time ratio like the Cubism SDK
+                    const c1 = segments[i + 2];
+                    const c2 = segments[i + 4];
+                    const lerp = (a, b) => a + (b - a) * ratio;
+                    const a = lerp(value, c1), b = lerp(c1, c2), c = lerp(c2, endValue);
+                    return lerp(lerp(a, b), lerp(b, c));
+                }
+                case 2:
+                    return value;
+                default:
+                    return endValue;
+            }
+        }
+        time = endTime;
+        value = endValue;
+        i += 1 + points * 2;
+    }
+    return value;
+}
+
+function easeSine(x) {
+    return x <= 0 ? 0 : x >= 1 ? 1 : 0.5 - 0.5 * Math.cos(x * Math.PI);
 }
 
 // Export the main Live2D class for direct use
@@ -91,12 +163,24 @@ export class AkronNovaLive2DModel {
         this.model = null;
         this.isLoaded = false;
         this.currentExpression = 0;
-        this.parameters = {};
+        this.parameters = {};  // Composed values of the last update
+        this.overrides = {};  // Set from Python (blink, mouth); applied over the motion
+        this.core = null;
+        this.parameterIndex = new Map();
+        this.modelUrl = null;
+        this.motionFiles = new Map();  // motion3.json URL -> Promise of the parsed file
+        this.motion = null;  // { curves, duration, loop, fadeIn, fadeOut, time }
     }
     
     async loadFromUrl(modelUrl) {
         try {
             this.model = await loadModel(modelUrl);
+            this.modelUrl = new URL(modelUrl, window.location.href);
+            const moc = this.model.model.FileReferences && this.model.model.FileReferences.Moc;
+            this.core = moc ? await loadCoreModel(new URL(moc, this.modelUrl)) : null;
+            if (this.core) {
+                this.core.parameters.ids.forEach((id, index) => this.parameterIndex.set(id, index));
+            }
             this.isLoaded = true;
             console.log('AkronNova Live2D model loaded successfully');
             return true;
@@ -106,6 +190,12 @@ export class AkronNovaLive2DModel {
         }
     }
     
+    async loadModel(modelUrl) {
+        if (!await this.loadFromUrl(modelUrl)) {
+            throw new Error(`Failed to load model from ${modelUrl}`);
+        }
+    }
+    
     setExpression(expressionIndex) {
         if (!this.isLoaded) {
             console.warn('Model not loaded yet');
@@ -122,11 +212,86 @@ export class AkronNovaLive2DModel {
             return;
         }
         
-        updateModel(this.model, deltaTime);
+        const parameters = {};
+        const motion = this.motion;
+        if (motion) {
+            motion.time += deltaTime;
+            if (motion.loop && motion.duration > 0) {
+                motion.time %= motion.duration;
+            } else if (motion.time >= motion.duration) {
+                this.motion = null;
+            }
+            let weight = motion.fadeIn > 0 ? easeSine(motion.time / motion.fadeIn) : 1;
+            if (!motion.loop && motion.fadeOut > 0) {
+                weight *= easeSine((motion.duration - motion.time) / motion.fadeOut);
+            }
+            for (const curve of motion.curves) {
+                const base = this.defaultValue(curve.Id);
+                parameters[curve.Id] = base + (evaluateCurve(curve.Segments, motion.time) - base) * weight;
+            }
+        }
+        Object.assign(parameters, this.overrides);
+        this.parameters = parameters;
+    }
+    
+    draw() {
+        // There is no mesh renderer on this page yet: commit the parameters to the core model
+        if (this.isLoaded) {
+            updateModel(this, this.parameters);
+        }
+    }
+    
+    defaultValue(parameterId) {
+        const index = this.parameterIndex.get(parameterId);
+        return index === undefined ? 0 : this.core.parameters.defaultValues[index];
     }
     
     setParameter(parameterId, value) {
-        setModelParameter(this.model, parameterId, value);
+        setModelParameter(this, parameterId, value);
+    }
+    
+    motionGroups() {
+        const references = this.model && this.model.model.FileReferences;
+        return (references && references.Motions) || {};
+    }
+    
+    async startMotion(group, index) {
+        if (!this.isLoaded) {
+            return false;
+        }
+        
+        const entry = (this.motionGroups()[group] || [])[index || 0];
+        if (!entry) {
+            console.warn(`Model has no motion ${group}[${index}]`);
+            return false;
+        }
+        const url = new URL(entry.File, this.modelUrl).href;
+        if (!this.motionFiles.has(url)) {
+            const loading = fetch(url).then((response) => {
+                if (!response.ok) {
+                    throw new Error(response.statusText);
+                }
+                return response.json();
+            });
+            loading.catch(() => this.motionFiles.delete(url));
+            this.motionFiles.set(url, loading);
+        }
+        try {
+            const data = await this.motionFiles.get(url);
+            const meta = data.Meta || {};
+            this.motion = {
+                curves: (data.Curves || []).filter((curve) => curve.Target === 'Parameter'),
+                duration: meta.Duration || 0,
+                loop: !!meta.Loop,
+                fadeIn: entry.FadeInTime ?? meta.FadeInTime ?? 0.5,
+                fadeOut: entry.FadeOutTime ?? meta.FadeOutTime ?? 0.5,
+                time: 0,
+            };
+            return true;
+        } catch (error) {
+            console.error(`Failed to load motion ${group}[${index}]:`, error);
+            return false;
+        }
     }
 }
 